@@ -0,0 +1,124 @@
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.backends import BACKENDS, Backend, numba_available  # noqa: E402
+from src.dataset import Dataset  # noqa: E402
+from src.ga import GA  # noqa: E402
+from src.local_search import LocalSearch  # noqa: E402
+from src.population import Population  # noqa: E402
+
+
+def random_dataset(n_cities, rng):
+    coords = np.column_stack((rng.uniform(-60, 70, n_cities), rng.uniform(-180, 180, n_cities)))
+    lat, lng = coords[:, 0], coords[:, 1]
+    distance_matrix = Dataset.get_distance_from_lat_lon_in_km(lat[:, None], lng[:, None], lat[None, :], lng[None, :])
+    return Dataset.from_arrays(distance_matrix, coords)
+
+
+def run_operators(backend, dataset, routes, seed):
+    """
+    Runs every operator of backend on copies of the same routes with the same seed. Returns results and times.
+    """
+    distance_matrix = dataset.distance_matrix
+    results, times = {}, {}
+
+    start = time.perf_counter()
+    population = Population(routes.copy())
+    kernel = backend.kernel("tour_lengths")
+    if kernel is None:
+        population.evaluate_batched(distance_matrix)
+    else:
+        kernel(distance_matrix, population.routes, np.arange(len(routes)), population.fitness)
+    times["tour length"] = time.perf_counter() - start
+    results["tour length"] = population.fitness.copy()
+
+    start = time.perf_counter()
+    population.mutate(np.arange(len(routes)), 0.95, 0.05, distance_matrix, np.random.default_rng(seed),
+                      backend.kernel("swap_mutation"))
+    times["swap mutation"] = time.perf_counter() - start
+    results["swap mutation"] = (population.routes.copy(), population.fitness.copy())
+
+    half = len(routes) // 2
+    for name in ("ox", "pmx"):
+        operator = backend.crossover(name)
+        start = time.perf_counter()
+        results[name] = operator(routes[:half], routes[half:2 * half], np.random.default_rng(seed))
+        times[name] = time.perf_counter() - start
+
+    local_search = LocalSearch(distance_matrix, max_passes=1, or_opt=False, two_opt=backend.kernel("two_opt"))
+    start = time.perf_counter()
+    results["2-opt"] = local_search.improve(routes[0])
+    times["2-opt"] = time.perf_counter() - start
+    return results, times
+
+
+def run_ga(backend, dataset, seed, generations):
+    ga = GA(100, dataset, True, 0.95, 0.95, 20, "tournament", 0.05, 10, False, crossover="pmx",
+            local_search={"elite": 2}, rng=seed, backend=backend)
+    ga.init_population()
+    ga.fitness()
+    start = time.perf_counter()
+    for _ in range(generations):
+        ga.new_population()
+        ga.fitness()
+    return (ga.population.routes[0].copy(), ga.best()[1]), time.perf_counter() - start
+
+
+def check(name, backend, result, reference):
+    if name in ("swap mutation", "2-opt", "ga"):
+        equal = np.array_equal(result[0], reference[0]) and np.array_equal(result[1], reference[1])
+    else:
+        equal = np.array_equal(result, reference)
+    assert equal, f"{backend}: {name} differs from numpy backend"
+
+
+def main():
+    """
+    Cross-backend equivalence check and timing. Every operator (and a short GA run) of every backend is run with the
+    same seed and compared to the numpy (reference) backend: routes and tour lengths must be identical. numba times
+    exclude the compilation, which is done by a warm-up run.
+    """
+    parser = ArgumentParser()
+    parser.add_argument("--cities", help="Numbers of cities.", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--routes", help="Number of routes processed by operators.", type=int, default=1000)
+    parser.add_argument("--generations", help="Generations of GA run.", type=int, default=20)
+    parser.add_argument("--backends", help="Compared backends.", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--seed", help="Seed of random number generator.", type=int, default=0)
+    args = parser.parse_args()
+
+    backends = [name for name in args.backends if name != "numba" or numba_available()]
+    if len(backends) < len(args.backends):
+        print("numba is not installed, numba backend is skipped")
+    if "numpy" not in backends:
+        backends.insert(0, "numpy")
+
+    print(f"{'cities':>8}  {'operator':<15}" + "".join(f"{name + ' [s]':>14}" for name in backends))
+    for n_cities in args.cities:
+        rng = np.random.default_rng(args.seed)
+        dataset = random_dataset(n_cities, rng)
+        routes = Population.random_routes(args.routes, n_cities, rng)
+
+        results, times = {}, {}
+        for name in backends:
+            backend = Backend(name)
+            if name == "numba":
+                run_operators(backend, dataset, routes[:4], args.seed)
+                run_ga(name, dataset, args.seed, 1)
+            results[name], times[name] = run_operators(backend, dataset, routes, args.seed)
+            results[name]["ga"], times[name]["ga"] = run_ga(name, dataset, args.seed, args.generations)
+
+        for operator in results["numpy"]:
+            for name in backends:
+                check(operator, name, results[name][operator], results["numpy"][operator])
+            print(f"{n_cities:>8}  {operator:<15}" + "".join(f"{times[name][operator]:>14.4f}" for name in backends))
+    print("all backends are equivalent")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import os
+import random
+import sys
+import time
+from argparse import ArgumentParser
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.crossover import CROSSOVERS  # noqa: E402
+from src.population import Population  # noqa: E402
+
+
+def list_crossover(p1, p2):
+    """
+    Previous implementation, membership of genes was checked against Python list.
+    """
+    children = []
+    for parent1, parent2 in zip(p1.tolist(), p2.tolist()):
+        gene1 = int(random.random() * len(parent1))
+        gene2 = int(random.random() * len(parent2))
+        chromosome_p1 = parent1[min(gene1, gene2):max(gene1, gene2)]
+        chromosome_p2 = [item for item in parent2 if item not in chromosome_p1]
+        children.append(chromosome_p1 + chromosome_p2)
+    return np.array(children)
+
+
+def main():
+    """
+    Throughput of crossover operators in children per second. Every produced child is checked to be a valid
+    permutation.
+    """
+    parser = ArgumentParser()
+    parser.add_argument("--cities", help="Numbers of cities.", type=int, nargs="+", default=[100, 1000, 3000])
+    parser.add_argument("--children", help="Number of children created in one batch.", type=int, default=1000)
+    args = parser.parse_args()
+
+    operators = dict(CROSSOVERS)
+    operators["list (previous)"] = list_crossover
+
+    print(f"{'cities':>8}  {'operator':<18}{'children':>10}{'time [s]':>12}{'children/s':>14}")
+    for n_cities in args.cities:
+        for name, operator in operators.items():
+            # slow operators get smaller batches, the throughput is still comparable
+            n_children = args.children if name in ("ox", "pmx", "cx") else max(args.children // 20, 10)
+            p1 = Population.random_routes(n_children, n_cities)
+            p2 = Population.random_routes(n_children, n_cities)
+
+            start = time.perf_counter()
+            children = operator(p1, p2)
+            elapsed = time.perf_counter() - start
+
+            assert (np.sort(children, axis=1) == np.arange(n_cities)).all(), name
+            print(f"{n_cities:>8}  {name:<18}{n_children:>10}{elapsed:>12.4f}{n_children / elapsed:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.cache import DistanceCache  # noqa: E402
+from src.dataset import Dataset  # noqa: E402
+
+
+def measure(csv_path, cache_dir=None, sparse_neighbours=None):
+    """
+    Builds the distance matrix for one csv file and reports build time and peak RSS of the process.
+    """
+    cache = DistanceCache(cache_dir) if cache_dir is not None else None
+    start = time.perf_counter()
+    dataset = Dataset(csv_path, cache=cache, sparse_neighbours=sparse_neighbours)
+    dataset.__build__()
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is reported in kilobytes on Linux
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"csv": os.path.basename(csv_path), "places": len(dataset), "build_s": round(elapsed, 4),
+            "matrix_mb": round(dataset.distance_matrix.nbytes / 2 ** 20, 2), "peak_rss_mb": round(rss, 2)}
+
+
+def main():
+    """
+    Every csv is measured in a fresh interpreter, so the peak RSS of one dataset does not leak into another. With
+    cache directory, every csv is measured twice, cold (empty cache) and warm start. With sparse neighbours, the
+    sparse distance matrix is built instead of the dense one.
+    """
+    parser = ArgumentParser()
+    parser.add_argument("--csv-dir", help="Directory with csv datasets.", type=str, default="./csv")
+    parser.add_argument("--cache-dir", help="Measure cold and warm start with distance matrix cache.", type=str,
+                        default=None)
+    parser.add_argument("--sparse-neighbours", help="Build sparse distance matrix with k nearest neighbours.", type=int,
+                        default=None)
+    parser.add_argument("--single", help="Measure only given csv in this process.", type=str, default=None)
+    args = parser.parse_args()
+
+    if args.single is not None:
+        print(json.dumps(measure(args.single, args.cache_dir, args.sparse_neighbours)))
+        return
+
+    starts = ["cold", "warm"] if args.cache_dir is not None else ["-"]
+    print(f"{'csv':<12}{'start':>6}{'places':>8}{'build [s]':>12}{'matrix [MB]':>14}{'peak RSS [MB]':>16}")
+    for csv_path in sorted(glob.glob(os.path.join(args.csv_dir, "*.csv"))):
+        for start in starts:
+            command = [sys.executable, os.path.abspath(__file__), "--single", csv_path]
+            if args.cache_dir is not None:
+                command += ["--cache-dir", args.cache_dir]
+            if args.sparse_neighbours is not None:
+                command += ["--sparse-neighbours", str(args.sparse_neighbours)]
+            out = subprocess.run(command, capture_output=True, text=True, check=True)
+            row = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{row['csv']:<12}{start:>6}{row['places']:>8}{row['build_s']:>12}{row['matrix_mb']:>14}"
+                  f"{row['peak_rss_mb']:>16}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.loader import convert, load_places  # noqa: E402
+
+
+def previous_load(path, number_of_rows=None, random_pick=False, selected_places=None, rng=None):
+    """
+    Previous implementation, the whole csv was parsed with default dtypes and filtered afterwards.
+    """
+    import pandas as pd
+    df = pd.read_csv(path)
+    if selected_places is not None:
+        df = df[df['place'].isin(selected_places)].reset_index()
+    elif number_of_rows is not None:
+        if random_pick:
+            df = df.sample(n=number_of_rows, ignore_index=True, random_state=rng)
+        else:
+            df = df.head(number_of_rows)
+    return df['place'].tolist(), df[['lat', 'lng']].to_numpy(dtype=np.float64)
+
+
+def import_time(module):
+    """
+    Import time of module in a fresh interpreter.
+    """
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=root)
+    return float(out.stdout)
+
+
+def measure(load, path, repeat, **selection):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load(path, rng=np.random.default_rng(0), **selection)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """
+    Import time of dataset module and load time of every csv in csv/ (the best of repeated loads): previous loader,
+    projected and pre-filtered csv read and binary dataset. Places are loaded whole, first n_rows, random n_rows and
+    selected places.
+    """
+    parser = ArgumentParser()
+    parser.add_argument("--csv-dir", help="Directory with csv datasets.", type=str, default="./csv")
+    parser.add_argument("--n-rows", help="Number of first or random places.", type=int, default=100)
+    parser.add_argument("--repeat", help="Number of repeated loads.", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"import src.dataset: {import_time('src.dataset'):.3f} s, import pandas: {import_time('pandas'):.3f} s\n")
+    loaders = {"previous": previous_load, "csv": load_places, "binary": load_places}
+    print(f"{'csv':<12}{'selection':<12}" + "".join(f"{name + ' [ms]':>16}" for name in loaders))
+    with tempfile.TemporaryDirectory() as binary_dir:
+        for csv_path in sorted(glob.glob(os.path.join(args.csv_dir, "*.csv"))):
+            binary_path = os.path.join(binary_dir, os.path.basename(csv_path))
+            convert(csv_path, binary_path)
+            places = load_places(csv_path)[0]
+            selections = {"all": {}, "first": {"number_of_rows": args.n_rows},
+                          "random": {"number_of_rows": args.n_rows, "random_pick": True},
+                          "selected": {"selected_places": places[::max(len(places) // 10, 1)]}}
+            for name, selection in selections.items():
+                results = [loader(path, rng=np.random.default_rng(0), **selection)
+                           for loader, path in ((previous_load, csv_path), (load_places, csv_path),
+                                                (load_places, binary_path))]
+                assert all(np.array_equal(result[1], results[0][1]) for result in results), name
+                times = [measure(previous_load, csv_path, args.repeat, **selection),
+                         measure(load_places, csv_path, args.repeat, **selection),
+                         measure(load_places, binary_path, args.repeat, **selection)]
+                print(f"{os.path.basename(csv_path):<12}{name:<12}" + "".join(f"{t * 1000:>16.2f}" for t in times))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import glob
+import json
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.dataset import Dataset  # noqa: E402
+from src.ga import GA  # noqa: E402
+from src.telemetry import Telemetry  # noqa: E402
+from src.utils import json_str_or_path  # noqa: E402
+
+PHASES = ("fitness", "selection", "crossover", "mutation")
+
+
+def replay(example_dir, seed, max_generations):
+    """
+    Replays one example with fixed seed (same loop and early stopping as main.py, without plotting). Returns report
+    with generations per second, time of each phase and the final distance.
+    """
+    ga_config = json_str_or_path(os.path.join(example_dir, "ga_config.json"))
+    data_config = json_str_or_path(os.path.join(example_dir, "data_config.json"))
+    dataset_seed, ga_seed = np.random.SeedSequence(seed).spawn(2)
+
+    dataset = Dataset(data_config["csv_data_path"], data_config["n_rows"], data_config["random_pick_dataset"],
+                      data_config["choose_my_route"], data_config["selected_places"],
+                      rng=np.random.default_rng(dataset_seed))
+    dataset.__build__()
+
+    telemetry = Telemetry()
+    ga = GA(pop_size=ga_config["population"], dataset=dataset, elitism=ga_config["elitism"],
+            crossover_prob=ga_config["crossover_prob"], mutation_prob=ga_config["mutation_prob"],
+            k_parents=ga_config["k_best"], selection=ga_config["selection"],
+            mutation_gene_change_percent=ga_config["mut_change"], tournament_k=ga_config["tournament_k"],
+            same_parents=ga_config["same_parents"], rng=np.random.default_rng(ga_seed), telemetry=telemetry)
+
+    start = time.perf_counter()
+    ga.init_population()
+    no_change_iter = 0
+    last_best_fitness = None
+    generations = min(ga_config["generations"], max_generations)
+    generation = 0
+    for generation in range(generations):
+        if no_change_iter == ga_config["iter_stop"]:
+            break
+        ga.fitness()
+        best_fitness = ga.population.fitness[0]
+        if last_best_fitness is not None:
+            no_change_iter = no_change_iter + 1 if last_best_fitness == best_fitness else 0
+        last_best_fitness = best_fitness
+        ga.new_population()
+    elapsed = time.perf_counter() - start
+    timings = telemetry.timings()
+
+    return {"example": os.path.basename(example_dir), "seed": seed, "places": len(dataset),
+            "population": ga.pop_size, "selection": ga.selection_type, "generations": generation + 1,
+            "wall_s": round(elapsed, 4), "generations_per_s": round((generation + 1) / elapsed, 2),
+            "phases_s": {phase: round(timings.get(phase, 0.0), 4) for phase in PHASES},
+            "counters": dict(telemetry.counters),
+            "final_distance": float(last_best_fitness)}
+
+
+def main():
+    """
+    Deterministic benchmark suite, replays examples/example1..example10 with fixed seeds and prints JSON report.
+    """
+    parser = ArgumentParser()
+    parser.add_argument("--examples-dir", help="Directory with examples.", type=str, default="./examples")
+    parser.add_argument("--examples", help="Names of examples, all by default.", type=str, nargs="*", default=None)
+    parser.add_argument("--seeds", help="Seeds, every example is replayed with each.", type=int, nargs="+",
+                        default=[0])
+    parser.add_argument("--max-generations", help="Limit of generations of one replay.", type=int, default=300)
+    parser.add_argument("--output", help="Path of JSON report, printed to stdout if not set.", type=str, default=None)
+    args = parser.parse_args()
+
+    if args.examples:
+        example_dirs = [os.path.join(args.examples_dir, name) for name in args.examples]
+    else:
+        example_dirs = sorted(glob.glob(os.path.join(args.examples_dir, "example*")),
+                              key=lambda path: int(os.path.basename(path)[len("example"):]))
+
+    report = []
+    for example_dir in example_dirs:
+        for seed in args.seeds:
+            report.append(replay(example_dir, seed, args.max_generations))
+            print(json.dumps(report[-1]), file=sys.stderr)
+
+    if args.output is None:
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
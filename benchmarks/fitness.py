@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.dataset import Dataset  # noqa: E402
+from src.population import Population  # noqa: E402
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    """
+    Compares whole population fitness evaluation: Individual.fitness called per individual (current path), route after
+    route evaluation over population array and batched gather.
+    """
+    parser = ArgumentParser()
+    parser.add_argument("--csv-data-path", help="Path to csv data.", type=str, default="./csv/it.csv")
+    parser.add_argument("--cities", help="Numbers of cities.", type=int, nargs="+", default=[50, 200, 1000, 3000])
+    parser.add_argument("--populations", help="Population sizes.", type=int, nargs="+",
+                        default=[100, 500, 1000, 5000])
+    parser.add_argument("--repeat", help="Number of repetitions, the best time is reported.", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'cities':>8}{'population':>12}{'per individual [s]':>20}{'route loop [s]':>16}{'batched [s]':>14}"
+          f"{'speedup':>10}")
+    for n_cities in args.cities:
+        dataset = Dataset(args.csv_data_path, number_of_rows=n_cities)
+        dataset.__build__()
+        for pop_size in args.populations:
+            population = Population.random(pop_size, len(dataset))
+            individuals = [population.individual(idx, dataset) for idx in range(pop_size)]
+
+            t_individual = best_of(lambda: sorted([ind.fitness() for ind in individuals]), args.repeat)
+            t_loop = best_of(lambda: (population.evaluate(dataset.distance_matrix), population.sort()), args.repeat)
+            t_batched = best_of(lambda: (population.evaluate_batched(dataset.distance_matrix), population.sort()),
+                                args.repeat)
+
+            reference = np.sort([ind.fitness() for ind in individuals])
+            population.evaluate_batched(dataset.distance_matrix)
+            assert np.allclose(np.sort(population.fitness), reference)
+
+            print(f"{len(dataset):>8}{pop_size:>12}{t_individual:>20.4f}{t_loop:>16.4f}{t_batched:>14.4f}"
+                  f"{t_individual / t_batched:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.dataset import Dataset  # noqa: E402
+from src.ga import GA  # noqa: E402
+
+
+def time_to_target(dataset, target, time_limit, local_search, args):
+    """
+    Runs GA until the best tour is not longer than target. Returns (wall clock time, generations, best distance),
+    time is None if the target was not reached within time_limit.
+    """
+    ga = GA(pop_size=args.population, dataset=dataset, elitism=True, crossover_prob=0.9, mutation_prob=0.5,
+            k_parents=args.population // 2, selection="tournament", mutation_gene_change_percent=args.mut_change,
+            tournament_k=5, same_parents=False, local_search=local_search)
+    start = time.perf_counter()
+    ga.init_population()
+    generation = 0
+    while True:
+        ga.fitness()
+        elapsed = time.perf_counter() - start
+        best = ga.population.fitness[0]
+        if best <= target:
+            return elapsed, generation, best
+        if elapsed > time_limit:
+            return None, generation, best
+        ga.new_population()
+        generation += 1
+
+
+def main():
+    """
+    Wall clock time to reach given tour length, plain GA vs. memetic GA (2-opt and Or-opt local search).
+    """
+    parser = ArgumentParser()
+    parser.add_argument("--csv-data-path", help="Path to csv data.", type=str, default="./csv/cz.csv")
+    parser.add_argument("--n-rows", help="Number of places.", type=int, default=None)
+    parser.add_argument("--target", help="Target tour length in km.", type=float, default=9000)
+    parser.add_argument("--time-limit", help="Time limit of one run in seconds.", type=float, default=60)
+    parser.add_argument("--population", help="Size of population.", type=int, default=100)
+    parser.add_argument("--mut-change", help="Mutated part of chromosome.", type=float, default=0.005)
+    args = parser.parse_args()
+
+    dataset = Dataset(args.csv_data_path, args.n_rows)
+    dataset.__build__()
+
+    configs = {
+        "plain GA": None,
+        "memetic (elite)": {"apply_to": "elite"},
+        "memetic (both)": {"apply_to": "both", "offspring_rate": 0.05},
+    }
+    print(f"places: {len(dataset)}, target: {args.target} km")
+    print(f"{'mode':<18}{'time [s]':>12}{'generations':>14}{'best [km]':>14}")
+    for name, local_search in configs.items():
+        elapsed, generations, best = time_to_target(dataset, args.target, args.time_limit, local_search, args)
+        elapsed = "not reached" if elapsed is None else f"{elapsed:.2f}"
+        print(f"{name:<18}{elapsed:>12}{generations:>14}{best:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.dataset import Dataset  # noqa: E402
+from src.ga import GA  # noqa: E402
+from src.memo import route_hashes  # noqa: E402
+from src.population import Population  # noqa: E402
+
+
+def run(dataset, generations, seed, **kwargs):
+    ga = GA(300, dataset, True, 0.95, 0.05, 20, "kbestselection", 0.005, 10, False, rng=seed, **kwargs)
+    start = time.perf_counter()
+    ga.init_population()
+    for _ in range(generations):
+        ga.fitness()
+        ga.new_population()
+    ga.fitness()
+    counters = ga.telemetry.counters
+    return (time.perf_counter() - start, ga.telemetry.timings()["fitness"], ga.population.fitness[0],
+            ga.memo.hit_rate if ga.memo is not None else None, counters["duplicates_replaced"])
+
+
+def main():
+    """
+    Cost of canonical route hashing compared to evaluation with dense and sparse distance matrix, and GA runs without
+    and with fitness memo and duplicate elimination (memo hit rate, replaced duplicates, time of fitness phase).
+    """
+    parser = ArgumentParser()
+    parser.add_argument("--csv", help="Dataset.", type=str, default="csv/cz.csv")
+    parser.add_argument("--routes", help="Number of hashed and evaluated routes.", type=int, default=2000)
+    parser.add_argument("--generations", help="Generations of GA runs.", type=int, default=200)
+    parser.add_argument("--seed", help="Seed of random number generator.", type=int, default=0)
+    args = parser.parse_args()
+
+    dense = Dataset(args.csv)
+    dense.__build__()
+    sparse = Dataset(args.csv, sparse_neighbours=16)
+    sparse.__build__()
+    population = Population.random(args.routes, len(dense), args.seed)
+
+    print(f"{'operation':<28}{'routes/s':>12}")
+    operations = {"route hashes": lambda: route_hashes(population.routes),
+                  "evaluation (dense)": lambda: population.evaluate_batched(dense.distance_matrix),
+                  "evaluation (sparse)": lambda: population.evaluate_batched(sparse.distance_matrix)}
+    for name, operation in operations.items():
+        start = time.perf_counter()
+        operation()
+        print(f"{name:<28}{args.routes / (time.perf_counter() - start):>12.0f}")
+
+    print(f"\n{'GA run':<28}{'time [s]':>10}{'fitness [s]':>13}{'best [km]':>12}{'hit rate':>10}{'replaced':>10}")
+    runs = {"plain": {}, "memo": {"memo_size": 100000},
+            "memo + dedup (random)": {"memo_size": 100000, "deduplicate": "random"},
+            "memo + dedup (mutate)": {"memo_size": 100000, "deduplicate": "mutate"}}
+    for name, kwargs in runs.items():
+        elapsed, fitness_s, best, hit_rate, replaced = run(dense, args.generations, args.seed, **kwargs)
+        hit_rate = f"{hit_rate:.1%}" if hit_rate is not None else "-"
+        print(f"{name:<28}{elapsed:>10.3f}{fitness_s:>13.3f}{best:>12.0f}{hit_rate:>10}{replaced:>10}")
+
+
+if __name__ == '__main__':
+    main()
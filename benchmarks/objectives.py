@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.dataset import Dataset  # noqa: E402
+from src.ga import GA, OBJECTIVES_DEFAULTS  # noqa: E402
+from src.nsga2 import crowding_distance, non_dominated_ranks  # noqa: E402
+from src.objectives import Objectives  # noqa: E402
+from src.population import Population  # noqa: E402
+
+
+def time_windows_config(dataset, rng, windows=10):
+    """
+    Config with all objectives and random two hour time windows of random places.
+    """
+    places = rng.choice(len(dataset), windows, replace=False)
+    opens = rng.uniform(0, 24, windows)
+    return dict(OBJECTIVES_DEFAULTS, names=["distance", "time", "time_windows"], service_time=0.25,
+                speed_factors={dataset.countries[place]: 0.5 for place in places[:windows // 2]},
+                time_windows={dataset.countries[place]: [float(start), float(start) + 2]
+                              for place, start in zip(places, opens)})
+
+
+def main():
+    """
+    Throughput of objective engine (one pass for all objectives) vs. per individual loop, time of non-dominated sorting
+    and crowding distance for growing populations and GA runs with weighted sum (tournament) and NSGA-II selection.
+    """
+    parser = ArgumentParser()
+    parser.add_argument("--csv", help="Dataset.", type=str, default="csv/cz.csv")
+    parser.add_argument("--routes", help="Number of evaluated routes.", type=int, default=2000)
+    parser.add_argument("--generations", help="Generations of GA runs.", type=int, default=200)
+    parser.add_argument("--seed", help="Seed of random number generator.", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    dataset = Dataset(args.csv)
+    dataset.__build__()
+    config = time_windows_config(dataset, rng)
+    population = Population.random(args.routes, len(dataset), rng)
+
+    print(f"{'evaluation':<36}{'routes/s':>12}")
+    for names in (["distance"], ["distance", "time"], config["names"]):
+        objectives = Objectives.from_config(dataset, dict(config, names=names))
+        start = time.perf_counter()
+        objectives.evaluate(population.routes)
+        elapsed = time.perf_counter() - start
+        print(f"{'engine (' + ', '.join(names) + ')':<36}{args.routes / elapsed:>12.0f}")
+    start = time.perf_counter()
+    for route in population.routes:
+        objectives.evaluate(route[None])
+    print(f"{'per individual (all objectives)':<36}{args.routes / (time.perf_counter() - start):>12.0f}")
+
+    print(f"\n{'population':<12}{'objectives':>12}{'sorting [ms]':>14}{'crowding [ms]':>15}{'fronts':>8}")
+    for size in (100, 1000, 5000):
+        for n_objectives in (2, 3):
+            values = rng.random((size, n_objectives))
+            start = time.perf_counter()
+            ranks = non_dominated_ranks(values)
+            sorting = time.perf_counter() - start
+            start = time.perf_counter()
+            crowding_distance(values, ranks)
+            crowding = time.perf_counter() - start
+            print(f"{size:<12}{n_objectives:>12}{sorting * 1000:>14.2f}{crowding * 1000:>15.2f}{ranks.max() + 1:>8}")
+
+    print(f"\n{'GA run':<12}{'time [s]':>10}{'distance':>12}{'time [h]':>10}{'windows [h]':>13}{'front':>7}")
+    for selection in ("tournament", "nsga2"):
+        ga = GA(300, dataset, True, 0.95, 0.5, 60, selection, 0.05, 5, False, rng=args.seed, objectives=config)
+        start = time.perf_counter()
+        ga.init_population()
+        for _ in range(args.generations):
+            ga.fitness()
+            ga.new_population()
+        ga.fitness()
+        elapsed = time.perf_counter() - start
+        front = int(np.count_nonzero(non_dominated_ranks(ga.population.objectives) == 0))
+        distance, hours, windows = ga.population.objectives[np.argmin(ga.population.fitness)]
+        print(f"{selection:<12}{elapsed:>10.3f}{distance:>12.0f}{hours:>10.1f}{windows:>13.1f}{front:>7}")
+
+
+if __name__ == '__main__':
+    main()
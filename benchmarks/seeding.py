@@ -0,0 +1,72 @@
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.dataset import Dataset  # noqa: E402
+from src.ga import GA  # noqa: E402
+from src.population import Population  # noqa: E402
+from src.seeding import SEEDING_METHODS, Seeder, cKDTree  # noqa: E402
+
+
+def best_after(dataset, seeding, generations, seed):
+    ga = GA(500, dataset, True, 0.95, 0.95, 100, "tournament", 0.0005, 10, False, seeding=seeding, rng=seed)
+    start = time.perf_counter()
+    ga.init_population()
+    ga.fitness()
+    initial = ga.population.fitness[0]
+    for _ in range(generations):
+        ga.new_population()
+        ga.fitness()
+    return initial, ga.population.fitness[0], time.perf_counter() - start
+
+
+def main():
+    """
+    Time of construction heuristics and length of their tours compared to random tours, and the best distance of GA
+    after a few generations with random and with seeded initial population.
+    """
+    parser = ArgumentParser()
+    parser.add_argument("--csv", help="Datasets.", nargs="+",
+                        default=["csv/world.csv", "csv/sk.csv", "csv/cz.csv", "csv/it.csv"])
+    parser.add_argument("--tours", help="Number of tours created by every method.", type=int, default=5)
+    parser.add_argument("--generations", help="Generations of GA run.", type=int, default=50)
+    parser.add_argument("--seed", help="Seed of random number generator.", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"spatial index: {'scipy cKDTree' if cKDTree is not None else 'brute force (scipy is not installed)'}")
+    print(f"{'dataset':<16}{'method':<22}{'time/tour [s]':>15}{'mean length [km]':>18}")
+    for path in args.csv:
+        dataset = Dataset(path)
+        dataset.__build__()
+        distance_matrix = dataset.distance_matrix
+        rng = np.random.default_rng(args.seed)
+
+        start = time.perf_counter()
+        seeder = Seeder(dataset.coords)
+        print(f"{path:<16}{'candidate lists':<22}{time.perf_counter() - start:>15.4f}")
+
+        routes = {"random": lambda: Population.random_routes(args.tours, len(dataset), rng)}
+        for method in SEEDING_METHODS:
+            routes[method] = lambda method=method: seeder.seed(args.tours, [method], rng)
+        for name, create in routes.items():
+            start = time.perf_counter()
+            tours = create()
+            elapsed = (time.perf_counter() - start) / args.tours
+            assert (np.sort(tours, axis=1) == np.arange(len(dataset))).all(), name
+            population = Population(tours)
+            population.evaluate_batched(distance_matrix)
+            print(f"{path:<16}{name:<22}{elapsed:>15.4f}{population.fitness.mean():>18.0f}")
+
+        for name, seeding in (("GA random", None), ("GA seeded", {"ratio": 0.1})):
+            initial, best, elapsed = best_after(dataset, seeding, args.generations, args.seed)
+            print(f"{path:<16}{name:<22}{elapsed:>15.4f}{initial:>18.0f} -> {best:.0f} after {args.generations} "
+                  f"generations")
+
+
+if __name__ == '__main__':
+    main()
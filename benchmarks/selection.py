@@ -0,0 +1,87 @@
+import os
+import random
+import sys
+import time
+from argparse import ArgumentParser
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.dataset import Dataset  # noqa: E402
+from src.ga import GA  # noqa: E402
+from src.population import Population  # noqa: E402
+
+STRATEGIES = ["roulettewheel", "tournament", "rankselection", "kbestselection", "random"]
+
+
+def previous_selection(ga, strategy):
+    """
+    Previous implementation, parents were drawn one by one and duplicates were checked by list.count.
+    """
+    pop_len = len(ga.population)
+    fitness = ga.population.fitness.tolist()
+    if strategy == "random":
+        return random.choices(range(pop_len), k=ga.k)
+    if strategy == "kbestselection":
+        return list(range(ga.k))
+    if strategy == "tournament":
+        parents = []
+        while len(parents) != ga.k:
+            parent = min(random.sample(range(pop_len), ga.tournament_k))
+            if parents.count(parent) == 0 or ga.same_parents:
+                parents.append(parent)
+        return parents
+    if strategy == "rankselection":
+        rank_sum = pop_len * (pop_len + 1) / 2
+        weights = [float(pop_len - idx) / rank_sum for idx in range(pop_len)]
+    else:
+        weights = [value / sum(fitness) for value in fitness]
+    parents = []
+    while len(parents) != ga.k:
+        parent = random.choices(population=range(pop_len), weights=weights)
+        if parents.count(parent[0]) == 0 or ga.same_parents:
+            parents += parent
+    return parents
+
+
+def main():
+    """
+    Microbenchmark of every selection strategy, previous loop based implementation vs. batched one.
+    """
+    parser = ArgumentParser()
+    parser.add_argument("--populations", help="Population sizes.", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--parents-ratio", help="Number of parents as a fraction of population.", type=float,
+                        default=0.5)
+    parser.add_argument("--tournament-k", help="Number of individuals for tournament.", type=int, default=10)
+    parser.add_argument("--same-parents", help="Same individuals can be selected as parents.", action="store_true")
+    args = parser.parse_args()
+
+    dataset = Dataset.from_arrays(np.zeros((10, 10)))
+    print(f"{'population':>10}{'parents':>9}  {'strategy':<16}{'previous [s]':>14}{'batched [s]':>13}{'speedup':>10}")
+    for pop_size in args.populations:
+        k_parents = max(int(pop_size * args.parents_ratio), 2)
+        ga = GA(pop_size=pop_size, dataset=dataset, elitism=False, crossover_prob=1.0, mutation_prob=0.0,
+                k_parents=k_parents, selection="tournament", mutation_gene_change_percent=0.0,
+                tournament_k=args.tournament_k, same_parents=args.same_parents)
+        ga.population = Population(np.zeros((pop_size, 1), dtype=np.int32),
+                                   np.sort(np.random.uniform(1000, 2000, pop_size)))
+
+        for strategy in STRATEGIES:
+            start = time.perf_counter()
+            previous_selection(ga, strategy)
+            t_previous = time.perf_counter() - start
+
+            start = time.perf_counter()
+            parents = ga.selection(strategy)
+            t_batched = time.perf_counter() - start
+
+            assert len(parents) == ga.k
+            if not args.same_parents and strategy != "random":
+                assert len(np.unique(parents)) == ga.k, strategy
+            print(f"{pop_size:>10}{ga.k:>9}  {strategy:<16}{t_previous:>14.5f}{t_batched:>13.5f}"
+                  f"{t_previous / max(t_batched, 1e-9):>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
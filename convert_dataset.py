@@ -0,0 +1,17 @@
+from argparse import ArgumentParser
+from src.loader import convert
+
+
+def main():
+    """
+    Converts csv dataset to binary dataset directory (memory mapped .npy files), which can be used as csv-data-path.
+    """
+    parser = ArgumentParser()
+    parser.add_argument("csv", help="Path to csv data.", type=str)
+    parser.add_argument("output", help="Output directory of binary dataset.", type=str)
+    args = parser.parse_args()
+    convert(args.csv, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,25 @@
 from typing import Any
+from src.cache import DistanceCache
+from src.convergence import Convergence
+from src.evolution import evolve
 from src.dataset import Dataset
 from argparse import ArgumentParser
 from src.ga import GA
+from src.frames import FrameRecorder
+from src.individual import Individual
+from src.population import Population
+import src.checkpoint as checkpoint
+from src.telemetry import Telemetry, GenerationWriter
+import src.islands as islands
 import src.app as app
-from src.utils import add_routes, json_str_or_path, json_init_args
+from src.utils import json_str_or_path, json_init_args
+import numpy as np
 import os
 
 
-def parse_arguments():
+def parse_arguments(argv=None):
     """
-    Argument parsing
+    Argument parsing, command line arguments are parsed if argv is not provided.
     """
     parser = ArgumentParser()
     parser.add_argument("--ga-config", help="Path to json config with GA parameters.", type=json_str_or_path)
@@ -24,78 +34,252 @@ def parse_arguments():
     parser.add_argument("--k-best", help="Number of k best individuals to preserve in next generation.", type=int,
                         default=100)
     parser.add_argument("--same-parents", help="Same individuals can be generated as parents.", type=bool, default=False)
-    parser.add_argument("--selection", help="Type of selection for parents.", type=str, default="tournament")
+    parser.add_argument("--selection", help="Type of selection for parents (roulettewheel, tournament, rankselection, "
+                                            "kbestselection, random or nsga2).", type=str, default="tournament")
     parser.add_argument("--mut-change", help="How big part of chromosome will be potentially changed in % / 100.",
                         type=float, default=0.0005)
     parser.add_argument("--show-only-changes", help="The graph animation will be showing only the generations where "
                                                     "the individual chromosome changed", type=bool, default=True)
+    parser.add_argument("--fitness-mode", help="Fitness evaluation mode (batched or individual).", type=str,
+                        default="batched")
+    parser.add_argument("--crossover", help="Crossover operator (ox, pmx, cx or erx).", type=str, default="ox")
+    parser.add_argument("--backend", help="Backend of tour length, swap mutation, OX/PMX crossover and 2-opt: numpy "
+                                          "(vectorized reference), numba (compiled kernels, falls back to python if "
+                                          "numba is not installed) or python (interpreted kernels).",
+                        choices=["python", "numpy", "numba"], default="numpy")
+    parser.add_argument("--local-search", help="JSON config of memetic stage (2-opt and Or-opt local search), e.g. "
+                                               "'{\"apply_to\": \"elite\", \"neighbours\": 8}'. Disabled if not set.",
+                        type=json_str_or_path, default=None)
+    parser.add_argument("--seeding", help="JSON config of initial population seeding by nearest-neighbour, greedy-edge "
+                                           "and space-filling-curve tours, e.g. '{\"ratio\": 0.1}'. Only random tours "
+                                           "if not set.", type=json_str_or_path, default=None)
+    parser.add_argument("--memo-size", help="Maximal number of routes in fitness memo (routes are identified by "
+                                            "hash invariant to rotation and direction). Disabled if 0.", type=int,
+                        default=0)
+    parser.add_argument("--deduplicate", help="Replace duplicate routes in population by random tours or mutated "
+                                              "copies. Disabled if not set.", choices=["random", "mutate"],
+                        default=None)
+    parser.add_argument("--objectives", help="JSON config of objectives (distance, time and time_windows) evaluated "
+                                             "for every route, fitness is their weighted sum, e.g. '{\"names\": "
+                                             "[\"distance\", \"time_windows\"], \"time_windows\": {\"Brno\": [0, "
+                                             "2]}}'. Only distance if not set.", type=json_str_or_path, default=None)
+    parser.add_argument("--convergence", help="JSON config of convergence detection (relative improvement over sliding "
+                                              "window, diversity collapse, time budget), e.g. '{\"window\": 50, "
+                                              "\"min_diversity\": 0.05, \"on_collapse\": \"restart\"}'. Only "
+                                              "iter-stop is used if not set (single population runs).",
+                        type=json_str_or_path, default=None)
     parser.add_argument("--iter-stop", help="Max number of iterations for no change fitness.", type=int, default=100)
+    parser.add_argument("--islands", help="Number of islands (independent populations run in parallel processes). "
+                                          "1 disables the island model.", type=int, default=1)
+    parser.add_argument("--migration-interval", help="Number of generations between migrations of islands.", type=int,
+                        default=50)
+    parser.add_argument("--migrants", help="Number of best individuals migrating to the next island.", type=int,
+                        default=2)
+    parser.add_argument("--seed", help="Seed of random number generator for reproducible runs.", type=int,
+                        default=None)
+    parser.add_argument("--quiet", help="Do not print progress of every generation, only the final result.",
+                        action="store_true")
+    parser.add_argument("--telemetry-path", help="Export per generation metrics (best, mean, diversity, time of "
+                                                 "phases) to .csv or .jsonl file.", type=str, default=None)
+    parser.add_argument("--checkpoint-path", help="Path of checkpoint file (.npz). Checkpointing is disabled if not "
+                                                  "set.", type=str, default=None)
+    parser.add_argument("--checkpoint-every", help="Number of generations between checkpoints.", type=int,
+                        default=500)
+    parser.add_argument("--resume", help="Resume the run from checkpoint-path, if it exists.", action="store_true")
     parser.add_argument("--n-rows",
                         help="Choose number of rows to be processed. If None is set, all rows will be processed.",
                         type=Any, default=None)
     parser.add_argument("--random-pick-dataset", help="Randomly pick entries from dataset.", type=bool, default=False)
+    parser.add_argument("--sparse-neighbours", help="Store only distances to k nearest neighbours of every place, the "
+                                                    "other distances are computed on demand (for datasets too large "
+                                                    "for dense distance matrix). Dense matrix is used if not set.",
+                        type=int, default=None)
+    parser.add_argument("--cache-dir", help="Directory of persistent distance matrix cache. Disabled if not set.",
+                        type=str, default=None)
+    parser.add_argument("--cache-max-mb", help="Maximal size of distance matrix cache in MB.", type=float,
+                        default=2048)
+    parser.add_argument("--frames-dir", help="Directory for recorded animation frames. Temporary directory is used "
+                                             "and removed after rendering if not set.", type=str, default=None)
+    parser.add_argument("--frame-every", help="Record only every n-th generation to animation (the last frame is "
+                                              "always recorded).", type=int, default=1)
+    parser.add_argument("--max-frames", help="Maximal number of animation frames.", type=int, default=None)
+    parser.add_argument("--render-max-frames", help="Maximal number of frames in rendered animation, recorded frames "
+                                                    "are thinned evenly.", type=int, default=None)
+    parser.add_argument("--include-plotlyjs", help="How plotly.js is included in html: true (inlined), cdn or "
+                                                   "directory.", type=str, default="true")
+    parser.add_argument("--no-show", help="Only save the animation, do not open it (batch runs).",
+                        action="store_true")
     parser.add_argument("--save-path", help="Animation plots save path.", type=str, default="./animations/tsp.html")
     parser.add_argument("--choose-my-route", help="If set to True, your own route path for TSP will be selected.", type=bool, default=False)
     parser.add_argument("--selected-places", help="If choose-my-route is set to True, enter the path in list format.", type=list, default=[])
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     return args
 
 
-def main():
-    args = parse_arguments()
-    args = json_init_args(args, args.ga_config, args.data_config)
+def get_ga_kwargs(args):
+    """
+    Keyword arguments of GA given by parsed arguments.
+    """
+    return dict(pop_size=args.population, elitism=args.elitism, crossover_prob=args.crossover_prob,
+                mutation_prob=args.mutation_prob, k_parents=args.k_best, selection=args.selection,
+                mutation_gene_change_percent=args.mut_change, tournament_k=args.tournament_k,
+                same_parents=args.same_parents, fitness_mode=args.fitness_mode,
+                crossover=args.crossover, local_search=args.local_search, backend=args.backend,
+                seeding=args.seeding, memo_size=args.memo_size, deduplicate=args.deduplicate,
+                objectives=args.objectives)
 
-    # dataset parsing
-    dataset = Dataset(args.csv_data_path, args.n_rows, args.random_pick_dataset, args.choose_my_route, args.selected_places)
-    dataset.__build__()
 
-    # genetic algorithm initial setting
-    ga = GA(pop_size=args.population, dataset=dataset, elitism=args.elitism, crossover_prob=args.crossover_prob,
-            mutation_prob=args.mutation_prob, k_parents=args.k_best, selection=args.selection,
-            mutation_gene_change_percent=args.mut_change, tournament_k=args.tournament_k, same_parents=args.same_parents)
-    ga.init_population()
+def run_single(args, dataset, ga_kwargs, recorder, seed):
+    """
+    Main loop of the program executing generations of one population. Frames for animation are added to recorder.
+    """
+    telemetry = Telemetry()
+    ga = GA(dataset=dataset, rng=np.random.default_rng(seed), telemetry=telemetry, **ga_kwargs)
+    convergence = Convergence(**args.convergence) if args.convergence else None
 
     no_change_iter = 0
-    data = []
     last_best_fitness = None
+    start_generation = 0
 
-    # main loop of the program executing generation based on genetic algorithm
-    for i in range(args.generations):
-        # early stopping if there is no change in fitness for given number of generations
-        if no_change_iter == args.iter_stop:
-            break
-
-        # compute fitness for all individuals
-        ga.fitness()
+    resume = args.resume and os.path.exists(args.checkpoint_path)
+    if resume:
+        state = checkpoint.load(args.checkpoint_path, dataset)
+        ga.population = Population(state["routes"], state["fitness"])
+        ga.rng.bit_generator.state = state["rng_state"]
+        start_generation = state["generation"]
+        no_change_iter = state["no_change_iter"]
+        if "last_best_route" in state:
+            last_best_fitness = [Individual(dataset, args.mutation_prob, args.mut_change, ga.rng),
+                                 state["last_best_fitness"]]
+            last_best_fitness[0].set_chromosome(state["last_best_route"])
+        recorder.restore(state["frames"])
+        if convergence is not None and state["convergence"]:
+            convergence.restore(state["convergence"])
+    else:
+        ga.init_population()
 
-        # save last best fitness [Individual, fitness]
-        if last_best_fitness is not None:
-            if last_best_fitness[1] == ga.rated_population[0][1]:
-                no_change_iter += 1
-            else:
-                no_change_iter = 0
+    writer = None
+    if args.telemetry_path is not None:
+        writer = GenerationWriter(args.telemetry_path, telemetry, append=resume)
 
-        print(f"Generation #{i}")
-        print(f"Best fitness: {ga.rated_population[0][1]}")
+    def on_generation(i, best, last_best_fitness):
+        if not args.quiet:
+            print(f"Generation #{i}")
+            print(f"Best fitness: {best[1]}")
+        if writer is not None:
+            writer.add(i, best[1], float(np.mean(ga.population.fitness)), ga.population.diversity())
 
-        # appending data
+        # recording frames
         if not args.show_only_changes or i == 0:
-            data += add_routes(ga.rated_population[0], i)
+            recorder.add(i, best[0].chromosome, best[1])
         elif args.show_only_changes:
-            if last_best_fitness[0] != ga.rated_population[0][0] or (last_best_fitness[1] > ga.rated_population[0][1]):
-                data += add_routes(ga.rated_population[0], i)
+            if not np.array_equal(last_best_fitness[0].chromosome, best[0].chromosome) or \
+                    (last_best_fitness[1] > best[1]):
+                recorder.add(i, best[0].chromosome, best[1])
+
+    def on_new_population(generation, no_change_iter, last_best_fitness):
+        if args.checkpoint_path is not None and generation % args.checkpoint_every == 0:
+            checkpoint.save(args.checkpoint_path, ga, generation, no_change_iter, last_best_fitness, recorder,
+                            convergence)
+
+    # main loop of the program executing generation based on genetic algorithm
+    generation, no_change_iter, last_best_fitness = evolve(ga, args.generations, args.iter_stop, convergence,
+                                                           start_generation, no_change_iter, last_best_fitness,
+                                                           on_generation, on_new_population)
+
+    if args.checkpoint_path is not None:
+        checkpoint.save(args.checkpoint_path, ga, generation, no_change_iter, last_best_fitness, recorder,
+                        convergence)
+
+    if writer is not None:
+        writer.close()
+    if args.quiet:
+        print(f"Generations: {generation}")
+        print(f"Best fitness: {last_best_fitness[1]}")
+        if convergence is not None and convergence.reason is not None:
+            print(f"Converged: {convergence.reason}")
+        if ga.memo is not None:
+            print(f"Fitness memo: {ga.memo.hits} hits, {ga.memo.misses} misses, hit rate {ga.memo.hit_rate:.1%}")
+        if ga.deduplicate is not None:
+            print(f"Duplicates replaced: {telemetry.counters['duplicates_replaced']}")
+        if ga.objectives is not None:
+            values = ga.objectives.evaluate(np.asarray([last_best_fitness[0].chromosome]))[0]
+            print("Objectives: " + ", ".join(f"{name}: {value:.3f}"
+                                             for name, value in zip(ga.objectives.names, values)))
+        print("Time of phases [s]: " + ", ".join(f"{phase}: {elapsed:.3f}"
+                                                  for phase, elapsed in telemetry.timings().items()))
+
+
+def run_islands(args, dataset, ga_kwargs, recorder, seed):
+    """
+    Runs the island model, the animation shows global best route after each migration epoch.
+    """
+    last_best_fitness = []
+    writer = GenerationWriter(args.telemetry_path) if args.telemetry_path is not None else None
+
+    def on_epoch(generation, route, fitness):
+        if not args.quiet:
+            print(f"Generation #{generation}")
+            print(f"Best fitness: {fitness}")
+        if writer is not None:
+            writer.add(generation, fitness)
+        if not args.show_only_changes or not last_best_fitness or last_best_fitness[-1] > fitness:
+            recorder.add(generation, route, fitness)
+            last_best_fitness.append(fitness)
+
+    islands.run(dataset, ga_kwargs, args.islands, args.generations, args.migration_interval, args.migrants,
+                args.iter_stop, on_epoch=on_epoch, seed=seed)
+    if writer is not None:
+        writer.close()
+    if args.quiet:
+        print(f"Best fitness: {last_best_fitness[-1]}")
+
+
+def main():
+    args = parse_arguments()
+    args = json_init_args(args, args.ga_config, args.data_config)
+    if args.resume and args.checkpoint_path is None:
+        raise Exception("Resume requires checkpoint path.")
+    if args.islands > 1 and (args.checkpoint_path is not None or args.resume):
+        raise Exception("Checkpointing is supported only for single population runs.")
+
+    # independent random streams for dataset sampling and for genetic algorithm
+    dataset_seed, ga_seed = np.random.SeedSequence(args.seed).spawn(2)
+
+    # dataset parsing
+    cache = None
+    if args.cache_dir is not None:
+        cache = DistanceCache(args.cache_dir, int(args.cache_max_mb * 2 ** 20))
+    dataset = Dataset(args.csv_data_path, args.n_rows, args.random_pick_dataset, args.choose_my_route,
+                      args.selected_places, cache=cache, rng=np.random.default_rng(dataset_seed),
+                      sparse_neighbours=args.sparse_neighbours)
+    dataset.__build__()
+
+    # genetic algorithm initial setting
+    ga_kwargs = get_ga_kwargs(args)
 
-        last_best_fitness = ga.rated_population[0]
-        # recreate population
-        ga.new_population()
+    frames_dir = args.frames_dir
+    if frames_dir is None and args.checkpoint_path is not None:
+        # frames of resumable run must outlive the process
+        frames_dir = args.checkpoint_path + ".frames"
+    recorder = FrameRecorder(frames_dir, args.frame_every, args.max_frames,
+                             clear=not (args.resume and args.checkpoint_path and os.path.exists(args.checkpoint_path)))
+    if args.islands > 1:
+        run_islands(args, dataset, ga_kwargs, recorder, ga_seed)
+    else:
+        run_single(args, dataset, ga_kwargs, recorder, ga_seed)
+    recorder.close()
 
     scope = "world"
     if os.path.basename(args.csv_data_path) != "world.csv":
         scope = "europe"
 
     # plot and save data
-    app.run(data, args.save_path, scope=scope)
+    include_plotlyjs = True if str(args.include_plotlyjs).lower() == "true" else args.include_plotlyjs
+    app.run(recorder, dataset, args.save_path, scope=scope, max_frames=args.render_max_frames,
+            include_plotlyjs=include_plotlyjs, show=not args.no_show)
+    recorder.cleanup()
 
 
 if __name__ == '__main__':
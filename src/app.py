@@ -1,32 +1,85 @@
-import pandas as pd
-import plotly.express as px
+import plotly.graph_objects as go
 import numpy as np
 
+FIRST_EDGE_COLOR = "firebrick"
+ROUTE_COLOR = "#32CD32"
 
-def run(data, save_path, scope):
+
+def thin_frames(frames, max_frames):
+    """
+    Selects at most max_frames evenly spaced frames, the first and the last frame are always kept.
+    """
+    if max_frames is None or len(frames) <= max_frames:
+        return frames
+    indices = np.unique(np.linspace(0, len(frames) - 1, max(max_frames, 2)).round().astype(int))
+    return [frames[idx] for idx in indices]
+
+
+def route_traces(route, dataset):
+    """
+    Two traces of one route, the first edge (highlighted) and the rest of the route back to the first place. Hover text
+    shows the place with the distance of edge leaving it.
+    """
+    route = np.asarray(route)
+    closed = np.append(route, route[0])
+    lat = dataset.coords[closed, 0]
+    lon = dataset.coords[closed, 1]
+    distances = np.asarray(dataset.distance_matrix[closed[:-1], closed[1:]])
+    names = [dataset.countries[idx] for idx in closed]
+    text = [f"{names[idx]}<br>{names[idx]}-{names[idx + 1]}: {distances[idx]} km" for idx in range(len(route))]
+    text.append(names[-1])
+
+    return [
+        go.Scattergeo(lat=lat[:2], lon=lon[:2], text=text[:2], hoverinfo="text", mode="lines+markers",
+                      line=dict(color=FIRST_EDGE_COLOR), marker=dict(color=FIRST_EDGE_COLOR)),
+        go.Scattergeo(lat=lat[1:], lon=lon[1:], text=text[1:], hoverinfo="text", mode="lines+markers",
+                      line=dict(color=ROUTE_COLOR), marker=dict(color=ROUTE_COLOR)),
+    ]
+
+
+def frame_title(fitness):
+    return "Shortest distance: " + str(round(fitness)) + "km (fitness)"
+
+
+def run(frames, dataset, save_path, scope, max_frames=None, include_plotlyjs=True, show=True, frame_duration=500):
     """
-    data: List of data to be plotted.
+    frames: Recorded frames (generation, route, fitness) to be plotted.
+    dataset: Dataset used to resolve coordinates and place names of routes.
     save_path: Path for html export
     scope: "world" or "europe" scope depending on the dataset
-    Plotting all the data with routes of TSP.
+    max_frames: Maximal number of animation frames, the frames are thinned evenly if there are more of them.
+    include_plotlyjs: True (inlined plotly.js), "cdn" or "directory", passed to plotly write_html.
+    show: Open the figure (blocking for some renderers), False for batch runs.
+    Plotting all the data with routes of TSP. Animation frames are built directly from route index arrays.
     """
-    df = pd.DataFrame(data, columns=['lat', 'lon', 'generation', 'place', 'distance', 'fitness', 'color'])
+    frames = thin_frames(list(frames), max_frames)
+    if not frames:
+        raise Exception("There are no frames to be plotted.")
 
-    fig = px.line_geo(df, lat="lat", lon="lon", animation_frame="generation", title="TSP using GA", markers=True,
-                      hover_data=["place", "distance"], color='color', locationmode='country names')
-    fig.update_layout(showlegend=False)
+    animation_frames = [go.Frame(data=route_traces(route, dataset), name=str(generation),
+                                 layout=go.Layout(title_text=frame_title(fitness)))
+                        for generation, route, fitness in frames]
+
+    play_args = dict(frame=dict(duration=frame_duration, redraw=True), fromcurrent=True,
+                     transition=dict(duration=frame_duration, easing="linear"), mode="immediate")
+    pause_args = dict(frame=dict(duration=0, redraw=False), transition=dict(duration=0), mode="immediate")
+    slider_steps = [dict(method="animate", label=frame.name, args=[[frame.name], pause_args])
+                    for frame in animation_frames]
+
+    fig = go.Figure(data=animation_frames[0].data, frames=animation_frames)
+    fig.update_layout(
+        title_text=frame_title(frames[0][2]), showlegend=False,
+        updatemenus=[dict(type="buttons", direction="left", showactive=False, x=0.1, y=0, xanchor="right",
+                          yanchor="top", pad=dict(r=10, t=70),
+                          buttons=[dict(label="&#9654;", method="animate", args=[None, play_args]),
+                                   dict(label="&#9724;", method="animate", args=[[None], pause_args])])],
+        sliders=[dict(active=0, x=0.1, y=0, len=0.9, xanchor="left", yanchor="top", pad=dict(b=10, t=60),
+                      currentvalue=dict(prefix="generation="), steps=slider_steps)])
     fig.update_geos(
         visible=True, resolution=50, scope=scope,
         showcountries=True, countrycolor="Black",
         showsubunits=True, subunitcolor='Brown')
 
-    fitness = df.fitness.unique()
-    if len(fitness) < len(fig.frames):
-        clone = fitness[-1]
-        fitness = np.concatenate((fitness, [clone for _ in range(len(fig.frames) - len(fitness))]))
-
-    for i, frame in enumerate(fig.frames):
-        frame.layout.title = "Shortest distance: " + str(round(fitness[i])) + "km (fitness)"
-
-    fig.show()
-    fig.write_html(save_path)
+    if show:
+        fig.show()
+    fig.write_html(save_path, include_plotlyjs=include_plotlyjs, auto_play=False)
@@ -0,0 +1,80 @@
+"""
+Backends of the performance critical operators (tour length, swap mutation, OX and PMX crossover, 2-opt moves). numpy
+backend is the reference implementation given by vectorized methods of Population, crossover module and LocalSearch.
+python and numba backends run the loop kernels of kernels module, python backend interprets them, numba backend
+compiles them on the first call (CPU only, compiled code is cached on disk). If numba is not installed, numba backend
+falls back to the pure Python kernels.
+"""
+import warnings
+
+import numpy as np
+
+from . import kernels
+from .crossover import cut_points, get_crossover
+
+BACKENDS = ("python", "numpy", "numba")
+KERNELS = ("tour_lengths", "swap_mutation", "ox", "pmx", "two_opt")
+
+_compiled = {}
+
+
+def numba_available():
+    try:
+        import numba  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _numba_kernels():
+    """
+    Compiles kernels by numba, the dispatchers are shared by all backends of the process.
+    """
+    if not _compiled:
+        import numba
+        for name in KERNELS:
+            _compiled[name] = numba.njit(cache=True)(getattr(kernels, name))
+    return _compiled
+
+
+class Backend:
+    """
+    Provides kernels of chosen backend. kernel returns None for numpy backend, so the callers use the reference
+    implementation.
+    """
+    def __init__(self, name="numpy"):
+        name = name.lower()
+        if name not in BACKENDS:
+            raise Exception("Unknown backend type.")
+        if name == "numba" and not numba_available():
+            warnings.warn("numba is not installed, pure Python kernels are used instead.")
+            name = "python"
+        self.name = name
+        if name == "numba":
+            self.kernels = _numba_kernels()
+        elif name == "python":
+            self.kernels = {name: getattr(kernels, name) for name in KERNELS}
+        else:
+            self.kernels = {}
+
+    def kernel(self, name):
+        return self.kernels.get(name)
+
+    def crossover(self, name):
+        """
+        Returns crossover operator by its name, OX and PMX are run by kernels, other operators are always vectorized.
+        """
+        operator = get_crossover(name)
+        kernel = self.kernel(name.lower())
+        if kernel is None:
+            return operator
+
+        def kernel_operator(p1, p2, rng=None, start=None, end=None):
+            # cut points are drawn the same way as by the reference operator
+            if start is None:
+                start, end = cut_points(len(p1), p1.shape[1], rng)
+            children = np.empty_like(p1)
+            kernel(p1, p2, np.asarray(start, dtype=np.intp), np.asarray(end, dtype=np.intp), children)
+            return children
+
+        return kernel_operator
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from .loader import BINARY_FILES, is_binary
+
+CACHE_FILES = ("distance_matrix.npy", "coords.npy", "places.npy")
+
+
+class DistanceCache:
+    """
+    Persistent on-disk cache of built datasets. Every entry is a directory named by the cache key with distance matrix,
+    coordinates and place names stored as .npy files, which are memory mapped when loaded. The key is a hash of the csv
+    contents together with the parameters selecting the places. Least recently used entries are evicted when the total
+    size of the cache exceeds max_bytes.
+    """
+    def __init__(self, cache_dir, max_bytes=2 * 2 ** 30):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(csv_data_path, number_of_rows, random_pick_dataset, choose_my_route, selected_places, dtype,
+            random_state=None):
+        """
+        Cache key, sha256 of the dataset contents and of the selection parameters. For random pick of places, the state
+        of the generator drawing the places is part of the key, so only seeded runs share the entry.
+        """
+        digest = hashlib.sha256()
+        # binary dataset is a directory, the key covers contents of all its files
+        paths = [os.path.join(csv_data_path, name) for name in BINARY_FILES] if is_binary(csv_data_path) \
+            else [csv_data_path]
+        for path in paths:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(2 ** 20), b""):
+                    digest.update(chunk)
+        selection = {"n_rows": number_of_rows, "random_pick_dataset": random_pick_dataset,
+                     "choose_my_route": choose_my_route,
+                     "selected_places": list(selected_places) if choose_my_route else None,
+                     "dtype": np.dtype(dtype).str, "random_state": random_state}
+        digest.update(json.dumps(selection, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def load(self, key):
+        """
+        Returns (distance_matrix, coords, places) memory mapped from cache, or None if the entry does not exist.
+        """
+        entry = os.path.join(self.cache_dir, key)
+        if not all(os.path.exists(os.path.join(entry, name)) for name in CACHE_FILES):
+            return None
+        # modification time of the entry is used as its last access time for eviction
+        os.utime(entry)
+        return tuple(np.load(os.path.join(entry, name), mmap_mode="r") for name in CACHE_FILES)
+
+    def save(self, key, distance_matrix, coords, places):
+        """
+        Saves arrays as a new entry. The entry is written to temporary directory first and then renamed, so the
+        concurrent runs never see partially written entry.
+        """
+        entry = os.path.join(self.cache_dir, key)
+        tmp = tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-")
+        try:
+            for name, array in zip(CACHE_FILES, (distance_matrix, coords, np.asarray(places, dtype=str))):
+                np.save(os.path.join(tmp, name), array)
+            os.replace(tmp, entry)
+        except OSError:
+            # entry was created meanwhile by another run
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict(keep=key)
+
+    def evict(self, keep=None):
+        """
+        Removes the least recently used entries until the cache fits into max_bytes.
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.startswith(".") or not os.path.isdir(path):
+                continue
+            size = sum(os.path.getsize(os.path.join(path, file)) for file in os.listdir(path))
+            entries.append((os.path.getmtime(path), size, name, path))
+
+        total = sum(entry[1] for entry in entries)
+        for _, size, name, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
@@ -0,0 +1,55 @@
+import json
+import os
+import numpy as np
+
+
+def save(path, ga, generation, no_change_iter, last_best_fitness, recorder, convergence=None):
+    """
+    Saves state of the run to a single .npz file: population routes (int32) with fitness, state of random generator,
+    generation counter, early stopping state, the last best route, state of animation frame recorder (frames not yet
+    flushed to its chunk files) and state of convergence detection, if it is used. The file is written next to the
+    target and renamed, so the previous checkpoint stays valid until the new one is completely written.
+    """
+    state = {
+        "routes": ga.population.routes,
+        "fitness": ga.population.fitness,
+        "rng_state": np.array(json.dumps(ga.rng.bit_generator.state)),
+        "generation": np.array(generation),
+        "no_change_iter": np.array(no_change_iter),
+        "places": np.asarray(ga.dataset.countries, dtype=str),
+    }
+    if last_best_fitness is not None:
+        state["last_best_route"] = np.asarray(last_best_fitness[0].chromosome, dtype=np.int32)
+        state["last_best_fitness"] = np.array(last_best_fitness[1])
+    for name, value in recorder.state().items():
+        state["frames_" + name] = value
+    if convergence is not None:
+        for name, value in convergence.state().items():
+            state["convergence_" + name] = value
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, **state)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load(path, dataset):
+    """
+    Loads checkpoint saved by save. Raises exception if the checkpoint was created for different places.
+    """
+    with np.load(path) as checkpoint:
+        state = {name: checkpoint[name] for name in checkpoint.files}
+    if state["places"].tolist() != list(dataset.countries):
+        raise Exception("Checkpoint was created for different dataset.")
+
+    state["rng_state"] = json.loads(str(state["rng_state"]))
+    state["generation"] = int(state["generation"])
+    state["no_change_iter"] = int(state["no_change_iter"])
+    if "last_best_fitness" in state:
+        state["last_best_fitness"] = float(state["last_best_fitness"])
+    state["frames"] = {name[len("frames_"):]: value for name, value in state.items() if name.startswith("frames_")}
+    state["convergence"] = {name[len("convergence_"):]: value for name, value in state.items()
+                            if name.startswith("convergence_")}
+    return state
@@ -0,0 +1,92 @@
+import time
+from collections import deque
+
+import numpy as np
+
+COLLAPSE_ACTIONS = ("stop", "restart", "hypermutation")
+
+
+class Convergence:
+    """
+    Convergence detection of the genetic algorithm, complementary to iter_stop (exact equality of the best fitness).
+    The run is stopped if the best fitness improved by less than min_improvement (relative) over the last window
+    generations or if the time budget in seconds is exhausted. Every diversity_every generations the edge diversity of
+    population is checked, when it drops below min_diversity the population has collapsed and it is either stopped,
+    restarted (keep best individuals, the rest are new random tours) or hypermutated (every gene of the other
+    individuals may be swapped with probability hypermutation). After max_restarts restarts or hypermutations the
+    collapse stops the run.
+    """
+    def __init__(self, window=50, min_improvement=1e-4, min_diversity=0.0, diversity_every=10, on_collapse="stop",
+                 max_restarts=3, keep=1, hypermutation=0.2, time_budget=None):
+        if on_collapse not in COLLAPSE_ACTIONS:
+            raise Exception("Unknown collapse action.")
+        self.window = window
+        self.min_improvement = min_improvement
+        self.min_diversity = min_diversity
+        self.diversity_every = diversity_every
+        self.on_collapse = on_collapse
+        self.max_restarts = max_restarts
+        self.keep = keep
+        self.hypermutation = hypermutation
+        self.time_budget = time_budget
+
+        self.history = deque(maxlen=window + 1)
+        self.start = time.perf_counter()
+        self.restarts = 0
+        self.diversity = None
+        self.reason = None
+
+    def update(self, generation, ga):
+        """
+        Checks convergence of rated (sorted) population of given generation. Returns True if the run should stop, the
+        reason is stored in reason. Collapsed population is restarted or hypermutated in place and rated again.
+        """
+        best = ga.population.fitness[0]
+        self.history.append(best)
+
+        if self.time_budget is not None and time.perf_counter() - self.start >= self.time_budget:
+            return self._stop("time budget")
+
+        if len(self.history) == self.history.maxlen:
+            improvement = (self.history[0] - best) / abs(self.history[0]) if self.history[0] else 0.0
+            if improvement < self.min_improvement:
+                return self._stop(f"improvement {improvement:.2e} in last {self.window} generations")
+
+        if self.min_diversity and generation % self.diversity_every == 0:
+            self.diversity = ga.population.diversity()
+            if self.diversity < self.min_diversity:
+                if self.on_collapse == "stop" or self.restarts >= self.max_restarts:
+                    return self._stop(f"diversity {self.diversity:.4f}")
+                self.restarts += 1
+                if self.on_collapse == "restart":
+                    ga.restart(self.keep)
+                else:
+                    ga.hypermutate(self.hypermutation, self.keep)
+                ga.telemetry.count(self.on_collapse)
+                ga.fitness()
+                # the new population gets the whole window to improve
+                self.history.clear()
+        return False
+
+    def state(self):
+        """
+        State of convergence detection as dictionary of arrays (history of the best fitness, number of restarts and
+        elapsed time of the time budget).
+        """
+        return {
+            "history": np.array(self.history, dtype=np.float64),
+            "restarts": np.array(self.restarts),
+            "elapsed": np.array(time.perf_counter() - self.start),
+        }
+
+    def restore(self, state):
+        """
+        Restores convergence detection from state, the time budget continues from the elapsed time.
+        """
+        self.history = deque(state["history"].tolist(), maxlen=self.window + 1)
+        self.restarts = int(state["restarts"])
+        self.start = time.perf_counter() - float(state["elapsed"])
+
+    def _stop(self, reason):
+        self.reason = reason
+        return True
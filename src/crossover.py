@@ -0,0 +1,165 @@
+"""
+Crossover operators working on whole batches of children at once. Every operator takes first and second parents as
+(n_children, n_cities) arrays of routes (row i of both arrays are parents of i-th child) and returns the array of
+children routes. Random decisions are drawn from rng (numpy Generator). Membership of genes is always checked by
+boolean masks indexed by city, so every operator is O(n) per child and always produces valid permutations.
+"""
+import numpy as np
+
+
+def _positions(routes):
+    """
+    Inverse permutation of every route, positions[r, city] is the index of city in routes[r].
+    """
+    n_routes, n_cities = routes.shape
+    positions = np.empty_like(routes)
+    positions[np.arange(n_routes)[:, None], routes] = np.arange(n_cities, dtype=routes.dtype)
+    return positions
+
+
+def cut_points(n_children, n_cities, rng=None):
+    """
+    Two random cut points for every child, returned as (start, end) arrays with start <= end.
+    """
+    rng = np.random.default_rng(rng)
+    gene1 = (rng.random(n_children) * n_cities).astype(np.intp)
+    gene2 = (rng.random(n_children) * n_cities).astype(np.intp)
+    return np.minimum(gene1, gene2), np.maximum(gene1, gene2)
+
+
+def ox(p1, p2, rng=None, start=None, end=None):
+    """
+    Order crossover. The child consists of genes start..end of first parent followed by the remaining genes in the
+    order they appear in the second parent.
+    """
+    n_children, n_cities = p1.shape
+    if start is None:
+        start, end = cut_points(n_children, n_cities, rng)
+    rows = np.arange(n_children)[:, None]
+    cols = np.arange(n_cities)[None, :]
+
+    segment = (cols >= start[:, None]) & (cols < end[:, None])
+    in_segment = np.zeros(p1.shape, dtype=bool)
+    in_segment[rows, p1] = segment
+
+    child = np.empty_like(p1)
+    # segment of the first parent is moved to the beginning of child
+    r, c = np.nonzero(segment)
+    child[r, c - start[r]] = p1[r, c]
+
+    # complement genes of the second parent keep their order behind the segment
+    keep = ~in_segment[rows, p2]
+    target = (end - start)[:, None] + np.cumsum(keep, axis=1) - 1
+    r, c = np.nonzero(keep)
+    child[r, target[r, c]] = p2[r, c]
+    return child
+
+
+def pmx(p1, p2, rng=None, start=None, end=None):
+    """
+    Partially mapped crossover. Genes start..end are taken from first parent in place, the rest from second parent,
+    conflicting genes are resolved through the mapping defined by the segment.
+    """
+    n_children, n_cities = p1.shape
+    if start is None:
+        start, end = cut_points(n_children, n_cities, rng)
+    rows = np.arange(n_children)[:, None]
+    cols = np.arange(n_cities)[None, :]
+
+    segment = (cols >= start[:, None]) & (cols < end[:, None])
+    in_segment = np.zeros(p1.shape, dtype=bool)
+    in_segment[rows, p1] = segment
+    positions1 = _positions(p1)
+
+    child = np.where(segment, p1, p2)
+    r, c = np.nonzero(~segment & in_segment[rows, child])
+    # every step moves the conflicting genes along the mapping, at most segment length steps are needed
+    while len(r):
+        genes = p2[r, positions1[r, child[r, c]]]
+        child[r, c] = genes
+        conflict = in_segment[r, genes]
+        r, c = r[conflict], c[conflict]
+    return child
+
+
+def cx(p1, p2, rng=None, start=None, end=None):
+    """
+    Cycle crossover. The cycle containing the first position is taken from first parent, the other genes from second
+    parent. All children follow their cycles at once.
+    """
+    n_children, n_cities = p1.shape
+    positions1 = _positions(p1)
+    in_cycle = np.zeros(p1.shape, dtype=bool)
+
+    rows = np.arange(n_children)
+    position = np.zeros(n_children, dtype=np.intp)
+    while len(rows):
+        in_cycle[rows, position] = True
+        position = positions1[rows, p2[rows, position]]
+        active = position != 0
+        rows = rows[active]
+        position = position[active]
+    return np.where(in_cycle, p1, p2)
+
+
+def erx(p1, p2, rng=None, start=None, end=None):
+    """
+    Edge recombination crossover. The child is built city by city, the next city is the unvisited neighbour (in any
+    of the parents) with the fewest unvisited neighbours, or a random unvisited city if there is none. The walk is
+    sequential by nature, so children are created one by one, but each in O(n).
+    """
+    rng = np.random.default_rng(rng)
+    n_children, n_cities = p1.shape
+    children = np.empty_like(p1)
+    random_orders = np.argsort(rng.random(p1.shape), axis=1)
+    tie_breaks = rng.random(p1.shape)
+
+    for child_idx in range(n_children):
+        # neighbours[city] = previous and next city in both parents (duplicates are shared edges)
+        neighbours = np.empty((n_cities, 4), dtype=np.intp)
+        for col, parent in enumerate((p1[child_idx], p2[child_idx])):
+            neighbours[parent, 2 * col] = np.roll(parent, 1)
+            neighbours[parent, 2 * col + 1] = np.roll(parent, -1)
+        neighbours = neighbours.tolist()
+        ties = tie_breaks[child_idx].tolist()
+        order = random_orders[child_idx].tolist()
+
+        visited = [False] * n_cities
+        route = children[child_idx]
+        current = int(p1[child_idx, 0])
+        next_random = 0
+        for position in range(n_cities):
+            route[position] = current
+            visited[current] = True
+
+            best, best_key = -1, None
+            for candidate in set(neighbours[current]):
+                if visited[candidate]:
+                    continue
+                key = (len({city for city in neighbours[candidate] if not visited[city]}), ties[candidate])
+                if best_key is None or key < best_key:
+                    best, best_key = candidate, key
+
+            if best < 0 and position + 1 < n_cities:
+                while visited[order[next_random]]:
+                    next_random += 1
+                best = order[next_random]
+            current = best
+    return children
+
+
+CROSSOVERS = {
+    "ox": ox,
+    "pmx": pmx,
+    "cx": cx,
+    "erx": erx,
+}
+
+
+def get_crossover(name):
+    """
+    Returns crossover operator by its name.
+    """
+    if name.lower() not in CROSSOVERS:
+        raise Exception("Unknown crossover type.")
+    return CROSSOVERS[name.lower()]
@@ -1,64 +1,126 @@
-import math
-import pandas as pd
+import numpy as np
+from .loader import load_places
+from .sparse import SparseDistanceMatrix
 
 
 class Dataset:
     """
-    Class for parsing csv datasets with provided countries lists and their corresponding latitude and longitude.
-    This class using build method, creates so-called distance matrix, represented as a dictionary to provide from-to
-    (country) information. This structure contains precomputed distances between each place or country.
+    Class for parsing csv datasets (or binary datasets converted by convert_dataset.py, see loader) with provided
+    countries lists and their corresponding latitude and longitude.
+    This class using build method, creates so-called distance matrix, represented as a dense N x N numpy array, where
+    row and column indices correspond to the positions of places in countries list. This structure contains precomputed
+    distances between each place or country. If cache is provided, built arrays are stored on disk and the next build
+    with the same csv and selection only memory maps them. Random pick of places is drawn from rng (numpy Generator or
+    seed). If sparse_neighbours is set, SparseDistanceMatrix storing only the distances to sparse_neighbours nearest
+    places is built instead of the dense matrix (the cache is not used then).
     """
     def __init__(self, csv_data_path, number_of_rows=None, random_pick_dataset=False, choose_my_route=False,
-                 selected_places=None
+                 selected_places=None, dtype=np.float64, cache=None, rng=None, sparse_neighbours=None
                  ):
-        self.df = pd.read_csv(csv_data_path)
-        self.distance_coords_dict = {}
+        self.csv_data_path = csv_data_path
+        self.cache = cache
+        self.distance_matrix = None
+        self.coords = None
         self.countries = []
+        self.place_index = {}
         self.n_of_rows = number_of_rows
         self.random_pick = random_pick_dataset
         self.selected_places = selected_places
         self.choose_my_route = choose_my_route
+        self.dtype = dtype
+        self.rng = np.random.default_rng(rng)
+        self.sparse_neighbours = sparse_neighbours
 
     def __build__(self):
         """
         :return: Distance matrix between each pair of points.
         """
+        cache = self.cache if not self.sparse_neighbours else None
+        if cache is not None:
+            key = self.cache.key(self.csv_data_path, self.n_of_rows, self.random_pick, self.choose_my_route,
+                                 self.selected_places, self.dtype,
+                                 self.rng.bit_generator.state if self.random_pick else None)
+            cached = cache.load(key)
+            if cached is not None:
+                self.distance_matrix, self.coords, places = cached
+                self.countries = places.tolist()
+                self.place_index = {place: idx for idx, place in enumerate(self.countries)}
+                return
 
-        # if selected then only the given specific route will be processed
-        if self.choose_my_route:
-            self.df = self.df[self.df['place'].isin(self.selected_places)].reset_index()
+        # if selected then only the given specific route will be processed, otherwise the subset of places can be
+        # selected (first or random n_of_rows places), the selection is applied while the dataset is read
+        self.countries, self.coords = load_places(self.csv_data_path, self.n_of_rows, self.random_pick,
+                                                  self.selected_places if self.choose_my_route else None, self.rng)
 
-        # no specific route is provided, but the subset of places will be selected (e.g. do not consider whole dataset)
-        elif self.n_of_rows is not None:
-            # pick random places
-            if self.random_pick:
-                self.df = self.df.sample(n=self.n_of_rows, ignore_index=True)
-            # pick first n_of_rows data samples
-            else:
-                self.df = self.df.head(self.n_of_rows)
+        # place -> index mapping, index is the row/column of the place in distance matrix
+        self.place_index = {place: idx for idx, place in enumerate(self.countries)}
 
-        # compute modified distance matrix represented as distance_coords_dict
-        for idx1, row1 in self.df.iterrows():
-            self.countries.append(row1.place)
-            for idx2, row2 in self.df.iterrows():
-                distance = self.get_distance_from_lat_lon_in_km(row1.lat, row1.lng,
-                                                                row2.lat, row2.lng)
-                self.distance_coords_dict[row1.place + "-" + row2.place] = \
-                    [distance, [row1.lat, row1.lng, row2.lat, row2.lng]]
+        # compute distance matrix
+        if self.sparse_neighbours:
+            self.distance_matrix = SparseDistanceMatrix(self.coords, self.sparse_neighbours,
+                                                        self.get_distance_from_lat_lon_in_km, self.dtype)
+        else:
+            self.distance_matrix = self.compute_distance_matrix(self.coords, self.dtype)
+
+        if cache is not None:
+            cache.save(key, self.distance_matrix, self.coords, self.countries)
+
+    def __len__(self):
+        return len(self.distance_matrix)
+
+    @classmethod
+    def from_arrays(cls, distance_matrix, coords=None, countries=None):
+        """
+        Creates already built dataset from precomputed arrays (e.g. distance matrix attached from shared memory),
+        without reading the csv.
+        """
+        dataset = cls.__new__(cls)
+        dataset.csv_data_path = None
+        dataset.cache = None
+        dataset.distance_matrix = distance_matrix
+        dataset.coords = coords
+        dataset.countries = list(countries) if countries is not None else []
+        dataset.place_index = {place: idx for idx, place in enumerate(dataset.countries)}
+        dataset.n_of_rows = None
+        dataset.random_pick = False
+        dataset.selected_places = None
+        dataset.choose_my_route = False
+        dataset.dtype = distance_matrix.dtype
+        dataset.rng = np.random.default_rng()
+        dataset.sparse_neighbours = None
+        return dataset
+
+    @staticmethod
+    def compute_distance_matrix(coords, dtype=np.float64, block_size=512):
+        """
+        Computes dense distance matrix using broadcasted haversine formula. Rows are computed in blocks, so the
+        temporary arrays stay bounded by block_size x N regardless of the dataset size.
+        """
+        n = len(coords)
+        lat = coords[:, 0]
+        lon = coords[:, 1]
+        matrix = np.empty((n, n), dtype=dtype)
+        for start in range(0, n, block_size):
+            end = min(start + block_size, n)
+            matrix[start:end] = Dataset.get_distance_from_lat_lon_in_km(lat[start:end, None], lon[start:end, None],
+                                                                        lat[None, :], lon[None, :])
+        return matrix
 
     @staticmethod
     def get_distance_from_lat_lon_in_km(lat1, lon1, lat2, lon2):
         """
         Method computes formally well-known formula to get distance in km, based on latitude and longitude values.
+        Works for scalars as well as for broadcastable numpy arrays.
         https://www.movable-type.co.uk/scripts/latlong.html
         """
         radius = 6371
-        d_lat = (lat2 - lat1) * (math.pi / 180)
-        d_lon = (lon2 - lon1) * (math.pi / 180)
+        d_lat = (lat2 - lat1) * (np.pi / 180)
+        d_lon = (lon2 - lon1) * (np.pi / 180)
 
-        a = math.sin(d_lat / 2) * math.sin(d_lat / 2) + math.cos(lat1 * (math.pi / 180)) * math.cos(
-            lat2 * (math.pi / 180)) * math.sin(d_lon / 2) * math.sin(d_lon / 2)
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+        a = np.sin(d_lat / 2) * np.sin(d_lat / 2) + np.cos(lat1 * (np.pi / 180)) * np.cos(
+            lat2 * (np.pi / 180)) * np.sin(d_lon / 2) * np.sin(d_lon / 2)
+        a = np.clip(a, 0.0, 1.0)
+        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
 
         dist = radius * c
         return dist
@@ -0,0 +1,36 @@
+def evolve(ga, generations, iter_stop, convergence=None, start_generation=0, no_change_iter=0, last_best_fitness=None,
+           on_generation=None, on_new_population=None):
+    """
+    Generation loop of one population shared by main.py and sweep workers. Every generation the population is rated,
+    the run stops when the best fitness has not changed for iter_stop generations or when convergence detection stops
+    it, otherwise the new population is created. A resumed run continues from start_generation with its early stopping
+    state and last best [Individual, fitness]. on_generation(i, best, last_best_fitness) is called after rating of i-th
+    generation, on_new_population(generation, no_change_iter, best) after creating the new population. Returns
+    (number of generations, no_change_iter, best [Individual, fitness]), the generations count only the rated ones and
+    the best is taken from the last rated population.
+    """
+    generation = start_generation
+    for i in range(start_generation, generations):
+        # early stopping if there is no change in fitness for given number of generations
+        if no_change_iter == iter_stop:
+            break
+
+        # compute fitness for all individuals
+        ga.fitness()
+        best = ga.best()
+        if last_best_fitness is not None:
+            no_change_iter = no_change_iter + 1 if last_best_fitness[1] == best[1] else 0
+        if on_generation is not None:
+            on_generation(i, best, last_best_fitness)
+
+        last_best_fitness = best
+        generation = i + 1
+        # early stopping if the run has converged, collapsed population may be restarted instead
+        if convergence is not None and convergence.update(i, ga):
+            break
+
+        # recreate population
+        ga.new_population()
+        if on_new_population is not None:
+            on_new_population(generation, no_change_iter, last_best_fitness)
+    return generation, no_change_iter, last_best_fitness
@@ -0,0 +1,114 @@
+import glob
+import os
+import shutil
+import tempfile
+import numpy as np
+
+
+class FrameRecorder:
+    """
+    Bounded-memory collection of animation frames. Frame is the best route of one generation stored as array of place
+    indices together with its fitness. Frames are buffered up to chunk_size and then streamed to .npz chunk files,
+    coordinates and labels are resolved only when the animation is rendered. Only every every-th generation is
+    recorded and at most max_frames frames are stored, the last added frame is always kept so the animation ends with
+    the final route. Existing chunks in directory are removed, unless clear is False (the recorder is restored from
+    checkpoint state).
+    """
+    def __init__(self, directory=None, every=1, max_frames=None, chunk_size=256, clear=True):
+        self.temporary = directory is None
+        self.directory = tempfile.mkdtemp(prefix="sfc-ga-frames-") if directory is None else directory
+        os.makedirs(self.directory, exist_ok=True)
+        if clear:
+            for path in glob.glob(os.path.join(self.directory, "frames_*.npz")):
+                os.remove(path)
+        self.every = max(every, 1)
+        self.max_frames = max_frames
+        self.chunk_size = chunk_size
+        self.n_frames = 0
+        self.n_chunks = 0
+        self._buffer = []
+        self._last = None
+
+    def add(self, generation, route, fitness):
+        """
+        Adds frame of given generation, returns True if it was recorded.
+        """
+        frame = (generation, np.array(route, dtype=np.int32), fitness)
+        if generation % self.every != 0 or (self.max_frames is not None and self.n_frames >= self.max_frames - 1):
+            # kept aside, it is stored on close if it remains the last one
+            self._last = frame
+            return False
+        self._last = None
+        self._buffer.append(frame)
+        self.n_frames += 1
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+        return True
+
+    def flush(self):
+        """
+        Writes buffered frames to a new chunk file.
+        """
+        if not self._buffer:
+            return
+        generations, routes, fitness = zip(*self._buffer)
+        np.savez(os.path.join(self.directory, f"frames_{self.n_chunks:05d}.npz"), generation=np.array(generations),
+                 route=np.stack(routes), fitness=np.array(fitness))
+        self.n_chunks += 1
+        self._buffer = []
+
+    def close(self):
+        """
+        Stores the last frame (if it was skipped) and flushes the buffer.
+        """
+        if self._last is not None:
+            self._buffer.append(self._last)
+            self.n_frames += 1
+            self._last = None
+        self.flush()
+
+    def state(self):
+        """
+        State of the recorder as dictionary of arrays (counters and frames not yet flushed to chunk files).
+        """
+        frames = list(self._buffer) + ([self._last] if self._last is not None else [])
+        n_cities = len(frames[0][1]) if frames else 0
+        return {
+            "n_frames": np.array(self.n_frames),
+            "n_chunks": np.array(self.n_chunks),
+            "n_buffered": np.array(len(self._buffer)),
+            "generation": np.array([frame[0] for frame in frames], dtype=np.int64),
+            "route": np.array([frame[1] for frame in frames], dtype=np.int32).reshape(len(frames), n_cities),
+            "fitness": np.array([frame[2] for frame in frames], dtype=np.float64),
+        }
+
+    def restore(self, state):
+        """
+        Restores recorder from state. Chunk files written after the state was taken are removed.
+        """
+        self.n_frames = int(state["n_frames"])
+        self.n_chunks = int(state["n_chunks"])
+        for path in glob.glob(os.path.join(self.directory, "frames_*.npz")):
+            if int(os.path.basename(path)[len("frames_"):-len(".npz")]) >= self.n_chunks:
+                os.remove(path)
+        frames = [(int(generation), route, float(fitness))
+                  for generation, route, fitness in zip(state["generation"], state["route"], state["fitness"])]
+        n_buffered = int(state["n_buffered"])
+        self._buffer = frames[:n_buffered]
+        self._last = frames[n_buffered] if len(frames) > n_buffered else None
+
+    def __iter__(self):
+        """
+        Iterates over recorded frames as (generation, route, fitness).
+        """
+        for path in sorted(glob.glob(os.path.join(self.directory, "frames_*.npz"))):
+            with np.load(path) as chunk:
+                for generation, route, fitness in zip(chunk["generation"], chunk["route"], chunk["fitness"]):
+                    yield int(generation), route, float(fitness)
+
+    def cleanup(self):
+        """
+        Removes frame directory, if it was created as temporary one.
+        """
+        if self.temporary:
+            shutil.rmtree(self.directory, ignore_errors=True)
@@ -1,21 +1,60 @@
-from .individual import Individual
 import numpy as np
-import random
+from .backends import Backend
+from .local_search import LocalSearch
+from .memo import FitnessMemo, route_hashes
+from .nsga2 import nsga2_order
+from .objectives import Objectives
+from .population import Population
+from .seeding import Seeder, SEEDING_METHODS
+from .telemetry import Telemetry
+
+LOCAL_SEARCH_DEFAULTS = {
+    "apply_to": "elite",  # elite, offspring or both
+    "elite": 1,  # number of best individuals improved every generation
+    "offspring_rate": 0.1,  # part of new individuals improved every generation
+    "neighbours": 8,
+    "max_passes": 10,
+    "or_opt": True,
+}
+SEEDING_DEFAULTS = {
+    "ratio": 0.1,  # part of initial population created by construction heuristics, the rest are random tours
+    "methods": list(SEEDING_METHODS),
+    "neighbours": 10,
+    "noise": 0.1,  # relative noise of edge lengths in repeated greedy tours
+}
+OBJECTIVES_DEFAULTS = {
+    "names": ["distance"],  # distance, time and time_windows
+    "weights": None,  # weights of objectives in fitness, all ones by default
+    "speed": 60.0,  # km/h
+    "speed_factors": None,  # place -> factor of speed on edges of the place
+    "service_time": 0.0,  # hours spent at every visited place
+    "time_windows": None,  # place -> [open, close] in hours after the departure from depot
+    "depot": None,  # the first place of dataset by default
+}
+# part of genes swapped in a clone replaced by its mutated copy in duplicate elimination
+DEDUPLICATE_MUTATION = 0.05
 
 
 class GA:
     """
     Class for genetic algorithm provides population initialization, fitness function, various parent selection methods,
-    crossover method and population recreation method.
+    crossover method and population recreation method. Population is stored as Population object (2-D array of
+    routes), parents are represented by row indices to the population sorted by fitness. All random decisions are drawn
+    from rng (numpy Generator or seed), so runs with the same seed follow the same trajectory. If objectives are
+    configured, fitness is the weighted sum of objectives evaluated by objective engine and NSGA-II selection sorts the
+    population by non-domination and crowding distance instead.
     """
 
     def __init__(self, pop_size, dataset, elitism, crossover_prob, mutation_prob,
-                 k_parents, selection, mutation_gene_change_percent, tournament_k, same_parents):
+                 k_parents, selection, mutation_gene_change_percent, tournament_k, same_parents,
+                 fitness_mode="batched", crossover="ox", local_search=None, rng=None, telemetry=None,
+                 backend="numpy", seeding=None, memo_size=0, deduplicate=None, objectives=None):
         self.pop_size = pop_size
+        self.rng = np.random.default_rng(rng)
+        self.telemetry = Telemetry() if telemetry is None else telemetry
         self.crossover_prob = crossover_prob
-        self.population = []
+        self.population = None
         self.dataset = dataset
-        self.rated_population = []
         self.elitism = elitism
         self.mutation_prob = mutation_prob
         self.k = k_parents
@@ -23,18 +62,63 @@ class GA:
         self.selection_type = selection
         self.mutation_gene_change_percent = mutation_gene_change_percent
         self.same_parents = same_parents
+        self.fitness_mode = fitness_mode
+        self.backend = Backend(backend)
+        if self.backend.kernels and not isinstance(dataset.distance_matrix, np.ndarray):
+            raise Exception("Kernel backends require dense distance matrix.")
+        self.crossover_operator = self.backend.crossover(crossover)
+        self._rank_probabilities = np.empty(0)
+        self.local_search = None
+        self._local_optima = set()
+        if local_search:
+            self.local_search_config = dict(LOCAL_SEARCH_DEFAULTS, **local_search)
+            self.local_search = LocalSearch(dataset.distance_matrix, self.local_search_config["neighbours"],
+                                            self.local_search_config["max_passes"],
+                                            self.local_search_config["or_opt"],
+                                            two_opt=self.backend.kernel("two_opt"))
+        if deduplicate not in (None, "random", "mutate"):
+            raise Exception("Unknown duplicate elimination type.")
+        self.objectives = None
+        if objectives:
+            self.objectives_config = dict(OBJECTIVES_DEFAULTS, **objectives)
+            self.objectives = Objectives.from_config(dataset, self.objectives_config)
+        # memo keeps all objectives of routes, routes in reverse direction differ if objectives are not symmetric
+        self._directed = self.objectives is not None and not self.objectives.symmetric
+        self.memo = None
+        if memo_size:
+            self.memo = FitnessMemo(memo_size, len(self.objectives) if self.objectives is not None else None)
+        self.deduplicate = deduplicate
+        self.seeder = None
+        if seeding:
+            if dataset.coords is None:
+                raise Exception("Seeding requires coordinates of places.")
+            self.seeding_config = dict(SEEDING_DEFAULTS, **seeding)
+            self.seeder = Seeder(dataset.coords, self.seeding_config["neighbours"], self.seeding_config["noise"])
         if elitism:
             self.k = k_parents - 1
 
     def init_population(self):
         """
-        Initialization of the population.
+        Initialization of the population. If seeding is enabled, the configured part of population is created by
+        nearest-neighbour, greedy-edge and space-filling-curve tours, the rest are random tours.
         """
-        for i in range(0, self.pop_size):
-            individual = Individual(self.dataset.distance_coords_dict, self.dataset.countries,
-                                    self.mutation_prob, self.mutation_gene_change_percent)
-            self.population.append(individual)
-            individual.create_route_chromosome()
+        if self.seeder is None:
+            self.population = Population.random(self.pop_size, len(self.dataset), self.rng)
+            return
+
+        with self.telemetry.phase("seeding", self):
+            count = min(round(self.pop_size * self.seeding_config["ratio"]), self.pop_size)
+            seeded = self.seeder.seed(count, self.seeding_config["methods"], self.rng)
+        routes = Population.random_routes(self.pop_size - count, len(self.dataset), self.rng)
+        self.population = Population(np.concatenate((seeded, routes)))
+
+    def best(self):
+        """
+        Returns the best individual of rated population as [Individual, fitness].
+        """
+        return [self.population.individual(0, self.dataset, self.mutation_prob, self.mutation_gene_change_percent,
+                                           self.rng),
+                float(self.population.fitness[0])]
 
     def selection(self, selection_factory):
         """
@@ -53,123 +137,306 @@ class GA:
             parents = self.k_best_selection()
         elif selection_factory.lower() == "random":
             parents = self.random_select()
+        elif selection_factory.lower() == "nsga2":
+            # population is sorted by crowded comparison, so the tournament is NSGA-II crowded tournament
+            parents = self.tournament()
         else:
             raise Exception("Unknown selection type.")
 
         return parents
 
-    def crossover(self, parents):
+    def crossover(self, parents, n_children):
         """
-        Crossover method always takes two random individuals from parents and does two point crossover which means that
-        the new individual's chromosome consists of one part of first parent and the second part is provided by next
-        parent.
+        Crossover method creates n_children at once. Each child has two different random individuals from parents and
+        the configured crossover operator (e.g. two point order crossover, where the new individual's chromosome
+        consists of one part of first parent and the second part is provided by next parent) is applied to all pairs
+        in one batch. Returns children chromosomes with their fitness, which is known only for children identical to
+        the second parent, otherwise NaN.
         """
-        chromosome_p1 = []
+        parents = np.asarray(parents)
 
-        if len(parents) > 2:  # choose two random parents for crossover
-            parents = random.sample(parents, 2)
+        # choose two random parents for crossover
+        first = (self.rng.random(n_children) * len(parents)).astype(np.intp)
+        second = (self.rng.random(n_children) * max(len(parents) - 1, 1)).astype(np.intp)
+        if len(parents) > 1:
+            second += second >= first
+        first, second = parents[first], parents[second]
 
-        # get two random indices in chromosome
-        gene1 = int(random.random() * len(parents[0].chromosome))
-        gene2 = int(random.random() * len(parents[1].chromosome))
+        chromosome_p1 = self.population.routes[first]
+        chromosome_p2 = self.population.routes[second]
+        children = self.crossover_operator(chromosome_p1, chromosome_p2, self.rng)
 
-        # find start and end position
-        start_pos = min(gene1, gene2)
-        end_pos = max(gene1, gene2)
+        copies = np.all(children == chromosome_p2, axis=1)
+        fitness = np.where(copies, self.population.fitness[second], np.nan)
+        return children, fitness
 
-        # append genes to chromosome part one, taken from first parent
-        for i in range(start_pos, end_pos):
-            chromosome_p1.append(parents[0].chromosome[i])
+    def new_population(self):
+        """
+        Creation of the new population.
+        """
 
-        # get complement genes (countries) of chromosome_p1 to satisfy TSP
-        chromosome_p2 = [item for item in parents[1].chromosome if item not in chromosome_p1]
+        # memetic stage, improvement of the best individuals before they are selected and preserved
+        if self.local_search is not None and self.local_search_config["apply_to"] in ("elite", "both"):
+            with self.telemetry.phase("local_search", self):
+                self.improve_elite()
 
-        # connect two partial chromosomes to create valid one
-        child_chromosome = chromosome_p1 + chromosome_p2
+        # selection
+        with self.telemetry.phase("selection", self):
+            parents = self.selection(self.selection_type)
 
-        # create new Individual object and set his chromosome
-        individual = Individual(self.dataset.distance_coords_dict, self.dataset.countries,
-                                self.mutation_prob, self.mutation_gene_change_percent)
-        individual.set_chromosome(child_chromosome)
+        # crossover or completely new individual
+        with self.telemetry.phase("crossover", self):
+            self.reproduce(parents)
 
-        return individual
+        # mutation of the individuals in population
+        with self.telemetry.phase("mutation", self):
+            self.mutate()
 
-    def new_population(self):
+        # memetic stage, improvement of randomly chosen offspring
+        if self.local_search is not None and self.local_search_config["apply_to"] in ("offspring", "both"):
+            with self.telemetry.phase("local_search", self):
+                self.improve_offspring()
+
+    def reproduce(self, parents):
         """
-        Creation of the new population.
+        Replaces population by the new one created from parents by crossover (or completely new individuals).
         """
-
-        # selection
-        parents = self.selection(self.selection_type)
-        parents = [individual[0] for individual in parents]
-        new_population = []
+        new_routes = np.empty_like(self.population.routes)
+        new_fitness = np.full(self.pop_size, np.nan)
 
         subtract_elitism = 0
         # if elitism is set, we need to have that individual as the first in population
         if self.elitism:
-            for obj in parents:
-                if id(obj) == id(self.rated_population[0][0]):
-                    parents.remove(self.rated_population[0][0])
+            parents = np.concatenate(([0], parents[parents != 0]))
+            new_routes[0] = self.population.routes[0]
+            new_fitness[0] = self.population.fitness[0]
             subtract_elitism = 1
-            parents = [self.rated_population[0][0]] + parents
-            new_population = [parents[0]]
 
-        # crossover or completely new individual
         # generates new individuals to satisfy population size
-        for idx in range(0, self.pop_size - subtract_elitism):
-            # crossover probability is satisfied
-            if np.random.uniform(0, 1) <= self.crossover_prob:
-                child = self.crossover(parents)
-            else:
-                child = Individual(self.dataset.distance_coords_dict, self.dataset.countries,
-                                   self.mutation_prob, self.mutation_gene_change_percent)
-                child.create_route_chromosome()
+        crossover = self.rng.uniform(0, 1, self.pop_size - subtract_elitism) <= self.crossover_prob
+        children = np.flatnonzero(crossover) + subtract_elitism
+        if len(children):
+            new_routes[children], new_fitness[children] = self.crossover(parents, len(children))
 
-            new_population.append(child)
+        fresh = np.flatnonzero(~crossover) + subtract_elitism
+        new_routes[fresh] = Population.random_routes(len(fresh), len(self.dataset), self.rng)
+        self.telemetry.count("children", len(children))
+        self.telemetry.count("fresh_individuals", len(fresh))
 
-        # mutation of the individuals in population
-        for idx, individual in enumerate(new_population):
-            # do not mutate the first one if elitism
-            if self.elitism:
-                if idx > 0:
-                    individual.mutate()
-            else:
-                individual.mutate()
+        self.population = Population(new_routes, new_fitness)
 
-        self.population = new_population
+    def mutate(self):
+        """
+        Mutation of the individuals in population, the first one is not mutated if elitism. Cached fitness of already
+        rated routes is updated by swap deltas.
+        """
+        mutated = self.population.mutate(np.arange(int(self.elitism), self.pop_size), self.mutation_prob,
+                                         self.mutation_gene_change_percent, self._delta_matrix, self.rng,
+                                         self.backend.kernel("swap_mutation"))
+        self.telemetry.count("mutated_individuals", len(mutated))
+
+    def restart(self, keep=1):
+        """
+        Restart of collapsed population, keep best individuals of rated population are preserved and the others are
+        replaced by random tours.
+        """
+        keep = min(keep, self.pop_size)
+        self.population.routes[keep:] = Population.random_routes(self.pop_size - keep, len(self.dataset), self.rng)
+        self.population.fitness[keep:] = np.nan
+
+    def hypermutate(self, rate, keep=1):
+        """
+        Hypermutation of collapsed population, every gene of all but keep best individuals is swapped with probability
+        rate. Fitness is updated by swap deltas.
+        """
+        self.population.mutate(np.arange(min(keep, self.pop_size), self.pop_size), rate, 1.0, self._delta_matrix,
+                               self.rng, self.backend.kernel("swap_mutation"))
+
+    def improve_offspring(self):
+        """
+        Improves randomly chosen part of new individuals by local search.
+        """
+        count = round((self.pop_size - int(self.elitism)) * self.local_search_config["offspring_rate"])
+        offspring = self.rng.choice(np.arange(int(self.elitism), self.pop_size), count, replace=False)
+        for idx in offspring:
+            self.population.routes[idx], gain = self.local_search.improve(self.population.routes[idx])
+            self.population.fitness[idx] -= gain
+            self.telemetry.count("local_search_improved", gain > 0)
+
+    def improve_elite(self):
+        """
+        Improves the best individuals of rated population by local search. Routes which are already local optima are
+        skipped, the population is sorted again afterwards.
+        """
+        local_optima = set()
+        for idx in range(min(self.local_search_config["elite"], self.pop_size)):
+            key = self.population.routes[idx].tobytes()
+            if key not in self._local_optima:
+                self.population.routes[idx], gain = self.local_search.improve(self.population.routes[idx])
+                self.population.fitness[idx] -= gain
+                self.telemetry.count("local_search_improved", gain > 0)
+                key = self.population.routes[idx].tobytes()
+            local_optima.add(key)
+        self._local_optima = local_optima
+        if self.objectives is not None:
+            self._evaluate()
+        self._sort()
 
     def fitness(self):
         """
-        Counts the fitness for entire population.
+        Counts the fitness for entire population. In batched mode all routes are evaluated by one vectorized gather,
+        individual mode evaluates route after route. Backends with kernels evaluate routes by tour length kernel.
+        Objectives (if configured) are evaluated by objective engine.
+        """
+        with self.telemetry.phase("fitness", self):
+            self._evaluate()
+            self._sort()
+            if self.deduplicate is not None and self._replace_duplicates():
+                self._evaluate()
+                self._sort()
+
+    @property
+    def _delta_matrix(self):
+        """
+        Distance matrix for swap deltas of fitness, None if fitness is not the tour length (objectives are evaluated
+        again).
+        """
+        return self.dataset.distance_matrix if self.objectives is None else None
+
+    def _sort(self):
+        """
+        Sorts rated population, by crowded comparison of objectives for NSGA-II selection, otherwise by fitness. The
+        individual with the lowest fitness is always the first one, so it is returned by best and kept by elitism.
+        """
+        if self.selection_type.lower() != "nsga2":
+            # we need to minimize fitness, which means sorting in ascending order
+            self.population.sort()
+            return
+        values = self.population.objectives
+        if values is None:
+            values = self.population.fitness[:, None]
+        order = nsga2_order(values, self.population.fitness)
+        best = np.argmin(self.population.fitness)
+        self.population.sort(np.concatenate(([best], order[order != best])))
+
+    def _evaluate(self):
+        """
+        Evaluates routes without valid fitness. Routes already seen (in any rotation or direction) take their fitness
+        from the memo, if it is enabled.
+        """
+        if self.objectives is not None:
+            self._evaluate_objectives()
+            return
+        # only the routes changed since the last evaluation are computed, the others have cached fitness
+        invalid = self.population.invalid()
+        self.telemetry.count("fitness_cache_hits", len(self.population) - len(invalid))
+        if self.memo is not None and len(invalid):
+            hashes = route_hashes(self.population.routes[invalid])
+            known = self.memo.lookup(hashes)
+            hit = ~np.isnan(known)
+            self.population.fitness[invalid[hit]] = known[hit]
+            self.telemetry.count("memo_hits", np.count_nonzero(hit))
+            self.telemetry.count("memo_misses", np.count_nonzero(~hit))
+            invalid, hashes = invalid[~hit], hashes[~hit]
+
+        tour_lengths = self.backend.kernel("tour_lengths")
+        if tour_lengths is not None:
+            tour_lengths(self.dataset.distance_matrix, self.population.routes, invalid, self.population.fitness)
+        elif self.fitness_mode == "batched":
+            self.population.evaluate_batched(self.dataset.distance_matrix, invalid)
+        elif self.fitness_mode == "individual":
+            self.population.evaluate(self.dataset.distance_matrix, invalid)
+        else:
+            raise Exception("Unknown fitness mode.")
+        self.telemetry.count("evaluations", len(invalid))
+        if self.memo is not None and len(invalid):
+            self.memo.store(hashes, self.population.fitness[invalid])
+
+    def _evaluate_objectives(self):
+        """
+        Evaluates objectives of all routes by objective engine, so the objectives stay aligned with routes of
+        population. Routes already seen take their objectives from the memo, if it is enabled.
+        """
+        routes = self.population.routes
+        values = np.full((len(routes), len(self.objectives)), np.nan)
+        rows = np.arange(len(routes))
+        if self.memo is not None:
+            hashes = route_hashes(routes, self._directed)
+            values = self.memo.lookup(hashes)
+            hit = ~np.isnan(values).any(axis=1)
+            self.telemetry.count("memo_hits", np.count_nonzero(hit))
+            self.telemetry.count("memo_misses", np.count_nonzero(~hit))
+            rows, hashes = rows[~hit], hashes[~hit]
+
+        values[rows] = self.objectives.evaluate(routes[rows])
+        self.telemetry.count("evaluations", len(rows))
+        if self.memo is not None and len(rows):
+            self.memo.store(hashes, values[rows])
+        self.population.objectives = values
+        self.population.fitness = self.objectives.fitness(values)
+
+    def _replace_duplicates(self):
+        """
+        Replaces clones (the same tour in any rotation or direction) in rated population by random tours or mutated
+        copies, the first (best) occurrence is kept. Every mutated copy gets at least one swap, copies which are still
+        duplicates (a gene swapped with itself or mutated into another tour of population) get random tours. Returns
+        number of clones whose route was changed.
         """
-        results = []
-        for individual in self.population:
-            results.append([individual, individual.fitness()])
-        # we need to minimize fitness, which means sorting in ascending order
-        self.rated_population = sorted(results, key=lambda x: x[1])
+        hashes = route_hashes(self.population.routes, self._directed)
+        first = np.zeros(len(hashes), dtype=bool)
+        first[np.unique(hashes, return_index=True)[1]] = True
+        clones = np.flatnonzero(~first)
+        if not len(clones):
+            return 0
+        before = self.population.routes[clones].copy()
+        if self.deduplicate == "mutate":
+            n_cities = len(self.dataset)
+            self.population.mutate(clones, 1.0, max(DEDUPLICATE_MUTATION, 1 / n_cities), self._delta_matrix, self.rng,
+                                   self.backend.kernel("swap_mutation"))
+            hashes = route_hashes(self.population.routes, self._directed)
+            _, inverse, counts = np.unique(hashes, return_inverse=True, return_counts=True)
+            clones_left = clones[counts[inverse[clones]] > 1]
+        else:
+            clones_left = clones
+        self.population.routes[clones_left] = Population.random_routes(len(clones_left), len(self.dataset), self.rng)
+        self.population.fitness[clones_left] = np.nan
+
+        replaced = int(np.count_nonzero(np.any(self.population.routes[clones] != before, axis=1)))
+        self.telemetry.count("duplicates_replaced", replaced)
+        return replaced
 
     def random_select(self):
         """
         Randomly selects k parents.
         """
-        return random.choices(self.rated_population, k=self.k)
+        return self.rng.integers(0, self.pop_size, self.k)
 
     def tournament(self):
         """
         Tournament based selection. It takes tournament_k representatives from population and selects the best k
-        according to minimal fitness.
+        according to minimal fitness. Population is sorted, so the lowest index is the best candidate. All tournaments
+        are played at once as argmin over (k, tournament_k) matrix of candidate indices (candidates are drawn with
+        replacement). If the same parents are not allowed, next round is played only among not yet selected
+        individuals for the missing parents, so every round selects at least one new parent.
         """
         if self.tournament_k > self.pop_size:
             raise Exception("Number of tournament candidates must be less than or equal size of population.")
+        self._check_parents_count()
 
-        parents = []
+        pool = np.arange(self.pop_size)
+        parents = np.empty(0, dtype=np.intp)
         while len(parents) != self.k:
-            candidates = random.sample(self.rated_population, self.tournament_k)
-            parent = [min(candidates, key=lambda candid: candid[1])]
+            missing = self.k - len(parents)
+            candidates = pool[self.rng.integers(0, len(pool), (missing, min(self.tournament_k, len(pool))))]
+            winners = candidates.min(axis=1)
+
+            if self.same_parents:
+                return winners
 
             # check if not already selected
-            if parents.count(parent[0]) == 0 or self.same_parents:
-                parents += parent
+            winners = winners[np.sort(np.unique(winners, return_index=True)[1])]
+            parents = np.concatenate((parents, winners))
+            pool = pool[~np.isin(pool, winners, assume_unique=True)]
 
         return parents
 
@@ -177,51 +444,36 @@ class GA:
         """
         Selects first k-best individuals from population.
         """
-        parents = self.rated_population[:self.k]
-        return parents
+        return np.arange(min(self.k, self.pop_size))
 
     def rank_selection(self):
         """
         Rank selection uses relative fitness to assign section probabilities. This relative fitness is counted by the
         order of sorted individuals according to their fitness. This selection may be more suitable, if many individuals
-        have a very similar fitness value.
+        have a very similar fitness value. Population is always sorted, so the probabilities depend only on its size.
         """
-        backward_sort_population = sorted(self.rated_population, key=lambda x: -x[1])
-        ranks = []
-        pop_len = len(backward_sort_population)
+        pop_len = len(self.population)
+        if len(self._rank_probabilities) != pop_len:
+            # population is sorted in ascending order of fitness, so the first one has the highest rank
+            rank_sum = pop_len * (pop_len + 1) / 2
+            self._rank_probabilities = np.arange(pop_len, 0, -1) / rank_sum
 
-        for i in range(1, len(backward_sort_population) + 1):
-            ranks.append(i)
-        rank_sum = pop_len * (pop_len + 1) / 2
-
-        probabilities = []
-        for rank in ranks:
-            probabilities.append((float(rank) / rank_sum))
-
-        parents = []
-        while len(parents) != self.k:
-            parent = random.choices(population=backward_sort_population, weights=probabilities)
-
-            if parents.count(parent[0]) == 0 or self.same_parents:
-                parents += parent
-        return parents
+        return self._choose_parents(self._rank_probabilities)
 
     def roulette(self):
         """
         Roulette wheel selection is similar to rank selection, but probabilities of selection are not based on ranks
         but the proportional fitness.
         """
-        sum_fitness = sum([individual[1] for individual in self.rated_population])
-
-        probabilities = []
+        return self._choose_parents(self.population.fitness / self.population.fitness.sum())
 
-        for individual in self.rated_population:
-            probabilities.append((individual[1] / sum_fitness))
-
-        parents = []
-        while len(parents) != self.k:
-            parent = random.choices(population=self.rated_population, weights=probabilities)
+    def _choose_parents(self, probabilities):
+        """
+        Draws k parents with given probabilities at once, without replacement if the same parents are not allowed.
+        """
+        self._check_parents_count()
+        return self.rng.choice(len(probabilities), self.k, replace=self.same_parents, p=probabilities)
 
-            if parents.count(parent[0]) == 0 or self.same_parents:
-                parents += parent
-        return parents
+    def _check_parents_count(self):
+        if not self.same_parents and self.k > self.pop_size:
+            raise Exception("Number of parents must be less than or equal size of population.")
@@ -1,17 +1,16 @@
-import random
 import numpy as np
 
 
 class Individual:
     """
-    Class representing one individual in population. Each individual can have encoded chromosome (e.g. list of countries
-    representing one route in TSP). Individual can also mutate the individual genes in chromosome and count the distance
-    of route using fitness method.
+    Class representing one individual in population. Each individual can have encoded chromosome (e.g. list of country
+    indices representing one route in TSP). Individual can also mutate the individual genes in chromosome and count the
+    distance of route using fitness method. All random decisions are drawn from rng (numpy Generator).
     """
-    def __init__(self, distance_coords_dict, countries_list, mut_prob, mutation_gene_change_percent):
+    def __init__(self, dataset, mut_prob, mutation_gene_change_percent, rng=None):
         self.chromosome = None
-        self.distance_coords_dict = distance_coords_dict
-        self.countries_list = countries_list
+        self.rng = np.random.default_rng(rng)
+        self.dataset = dataset
         self.mutation_prob = mut_prob
         self.mutation_gene_change_percent = mutation_gene_change_percent
 
@@ -19,22 +18,16 @@ class Individual:
         self.chromosome = chromosome
 
     def create_route_chromosome(self):
-        self.chromosome = random.sample(self.countries_list, len(self.countries_list))
+        self.chromosome = self.rng.permutation(len(self.dataset)).tolist()
 
     def fitness(self):
         """
-        Computes the distance based on chromosome.
+        Computes the distance based on chromosome. Chromosome holds indices to distance matrix, so the whole route is
+        gathered at once (from i-th to (i+1)-th place, the last one returns to the first) and its edges are added one
+        after another like by the population evaluation.
         """
-        path_distance = 0
-        for idx in range(0, len(self.chromosome)):
-            from_ = self.chromosome[idx]
-            if idx + 1 < len(self.chromosome):
-                to = self.chromosome[idx + 1]
-            else:
-                to = self.chromosome[0]
-
-            path_distance += self.distance_coords_dict[from_ + "-" + to][0]
-        return path_distance
+        route = np.asarray(self.chromosome)
+        return float(np.cumsum(self.dataset.distance_matrix[route, np.roll(route, -1)], dtype=np.float64)[-1])
 
     def mutate(self):
         """
@@ -44,9 +37,9 @@ class Individual:
         len_ = round(len(self.chromosome) * self.mutation_gene_change_percent)
         for idx in range(len_):
             # check if the probability of mutation is satisfied
-            if np.random.uniform(0, 1) <= self.mutation_prob:
+            if self.rng.uniform(0, 1) <= self.mutation_prob:
                 # save index in chromosome for mutation
-                swap_idx = int(random.random() * len(self.chromosome))
+                swap_idx = int(self.rng.random() * len(self.chromosome))
 
                 country1 = self.chromosome[idx]
                 country2 = self.chromosome[swap_idx]
@@ -0,0 +1,112 @@
+import multiprocessing as mp
+import numpy as np
+from .dataset import Dataset
+from .ga import GA
+from .shared import share_array, attach_array
+
+
+def _island_worker(spec, coords, countries, ga_kwargs, seed, commands, replies):
+    """
+    One island living in its own process. The distance matrix is attached from shared memory (sparse distance matrix is
+    received as a copy instead of the shared memory spec). On every "run" command the received migrants replace the
+    worst individuals, the island evolves for given number of generations and replies with its best routes.
+    """
+    if isinstance(spec, dict):
+        distance_matrix, shm = attach_array(spec)
+    else:
+        distance_matrix, shm = spec, None
+    dataset = Dataset.from_arrays(distance_matrix, coords, countries)
+
+    # every island has its own independent generator spawned from the run seed
+    ga = GA(dataset=dataset, rng=np.random.default_rng(seed), **ga_kwargs)
+    ga.init_population()
+
+    while True:
+        command = commands.get()
+        if command[0] == "stop":
+            break
+        _, migrants, generations, n_migrants = command
+
+        if migrants is not None and len(migrants):
+            ga.fitness()
+            ga.population.routes[-len(migrants):] = migrants
+            ga.population.fitness[-len(migrants):] = np.nan
+
+        for _ in range(generations):
+            ga.fitness()
+            ga.new_population()
+        ga.fitness()
+
+        top = ga.population.top(n_migrants)
+        replies.put((ga.population.routes[top].copy(), ga.population.fitness[top].copy()))
+
+    del ga, dataset, distance_matrix
+    if shm is not None:
+        shm.close()
+
+
+def run(dataset, ga_kwargs, islands, generations, migration_interval, migrants, iter_stop, on_epoch=None, seed=None):
+    """
+    Island model: runs islands independent GA populations in separate processes. Every migration_interval generations
+    each island sends its best migrants to the next island in the ring (island i -> island i + 1), where they replace
+    the worst individuals. Early stopping is checked on the global best after each epoch.
+
+    on_epoch(generation, route, fitness) is called with the global best after every epoch. Generators of islands are
+    spawned from seed (int or numpy SeedSequence).
+    Returns the global best as (route, fitness).
+    """
+    seeds = (seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)).spawn(islands)
+    if isinstance(dataset.distance_matrix, np.ndarray):
+        shm, spec = share_array(np.ascontiguousarray(dataset.distance_matrix))
+    else:
+        # sparse distance matrix is small, every island gets its own copy
+        shm, spec = None, dataset.distance_matrix
+    commands = [mp.Queue() for _ in range(islands)]
+    replies = [mp.Queue() for _ in range(islands)]
+    workers = [mp.Process(target=_island_worker,
+                          args=(spec, dataset.coords, dataset.countries, ga_kwargs, seeds[i], commands[i], replies[i]),
+                          daemon=True)
+               for i in range(islands)]
+
+    best_route, best_fitness = None, np.inf
+    try:
+        for worker in workers:
+            worker.start()
+
+        incoming = [None] * islands
+        no_change_iter = 0
+        generation = 0
+        while generation < generations and no_change_iter < iter_stop:
+            epoch = min(migration_interval, generations - generation)
+            for i in range(islands):
+                commands[i].put(("run", incoming[i], epoch, max(migrants, 1)))
+            results = [replies[i].get() for i in range(islands)]
+            generation += epoch
+
+            # ring topology, migrants of island i go to island i + 1
+            incoming = [results[i - 1][0][:migrants] if migrants > 0 else None for i in range(islands)]
+
+            island_best = min(range(islands), key=lambda i: results[i][1][0])
+            if results[island_best][1][0] < best_fitness:
+                best_route = results[island_best][0][0]
+                best_fitness = float(results[island_best][1][0])
+                no_change_iter = 0
+            else:
+                no_change_iter += epoch
+
+            if on_epoch is not None:
+                on_epoch(generation, best_route, best_fitness)
+
+        for i in range(islands):
+            commands[i].put(("stop",))
+        for worker in workers:
+            worker.join()
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+    return best_route, best_fitness
@@ -0,0 +1,179 @@
+"""
+Loop kernels of the genetic algorithm working directly on int32 route arrays. Kernels are plain Python functions written
+in the subset of Python supported by numba, so the same code is either interpreted (python backend) or compiled to
+machine code (numba backend), see backends module. Kernels do not call each other and write their results to output
+arrays given by the caller. Distances are summed in float64 regardless of the dtype of distance matrix.
+"""
+import numpy as np
+
+
+def tour_lengths(distance_matrix, routes, rows, fitness):
+    """
+    Writes the length of closed tour of every given row of routes to fitness.
+    """
+    n_cities = routes.shape[1]
+    for k in range(len(rows)):
+        route = routes[rows[k]]
+        total = 0.0
+        for idx in range(n_cities - 1):
+            total += float(distance_matrix[route[idx], route[idx + 1]])
+        total += float(distance_matrix[route[n_cities - 1], route[0]])
+        fitness[rows[k]] = total
+
+
+def swap_mutation(routes, rows, mutated, swap_idx, fitness, distance_matrix, delta, changed):
+    """
+    Swap mutation of given rows, mutated and swap_idx are (genes, rows) arrays of random decisions, gene idx of k-th row
+    is swapped with gene swap_idx[idx, k] if mutated[idx, k]. If delta is set, fitness is updated by the lengths of
+    edges entering and leaving both swapped positions. Changed rows are marked in changed.
+    """
+    n_cities = routes.shape[1]
+    for idx in range(mutated.shape[0]):
+        for k in range(len(rows)):
+            j = swap_idx[idx, k]
+            if not mutated[idx, k] or j == idx:
+                continue
+            route = routes[rows[k]]
+            a, c = (idx - 1) % n_cities, (j - 1) % n_cities
+            # edges starting at c or j are counted only once when the swapped genes are neighbours
+            count_c = c != a and c != idx
+            count_j = j != a and j != idx
+            if delta:
+                before = (float(distance_matrix[route[a], route[(a + 1) % n_cities]])
+                          + float(distance_matrix[route[idx], route[(idx + 1) % n_cities]]))
+                if count_c:
+                    before += float(distance_matrix[route[c], route[(c + 1) % n_cities]])
+                if count_j:
+                    before += float(distance_matrix[route[j], route[(j + 1) % n_cities]])
+
+            gene = route[idx]
+            route[idx] = route[j]
+            route[j] = gene
+            changed[rows[k]] = True
+
+            if delta:
+                after = (float(distance_matrix[route[a], route[(a + 1) % n_cities]])
+                         + float(distance_matrix[route[idx], route[(idx + 1) % n_cities]]))
+                if count_c:
+                    after += float(distance_matrix[route[c], route[(c + 1) % n_cities]])
+                if count_j:
+                    after += float(distance_matrix[route[j], route[(j + 1) % n_cities]])
+                fitness[rows[k]] += after - before
+
+
+def ox(p1, p2, start, end, children):
+    """
+    Order crossover, genes start..end of first parent followed by the remaining genes of second parent in their order.
+    """
+    n_children, n_cities = p1.shape
+    in_segment = np.zeros(n_cities, dtype=np.bool_)
+    for r in range(n_children):
+        in_segment[:] = False
+        k = 0
+        for idx in range(start[r], end[r]):
+            children[r, k] = p1[r, idx]
+            in_segment[p1[r, idx]] = True
+            k += 1
+        for idx in range(n_cities):
+            gene = p2[r, idx]
+            if not in_segment[gene]:
+                children[r, k] = gene
+                k += 1
+
+
+def pmx(p1, p2, start, end, children):
+    """
+    Partially mapped crossover, genes start..end of first parent in place, conflicting genes of second parent are
+    replaced through the mapping defined by the segment.
+    """
+    n_children, n_cities = p1.shape
+    in_segment = np.zeros(n_cities, dtype=np.bool_)
+    positions1 = np.empty(n_cities, dtype=np.intp)
+    for r in range(n_children):
+        in_segment[:] = False
+        for idx in range(n_cities):
+            positions1[p1[r, idx]] = idx
+        for idx in range(start[r], end[r]):
+            in_segment[p1[r, idx]] = True
+        for idx in range(n_cities):
+            if start[r] <= idx < end[r]:
+                children[r, idx] = p1[r, idx]
+            else:
+                gene = p2[r, idx]
+                while in_segment[gene]:
+                    gene = p2[r, positions1[gene]]
+                children[r, idx] = gene
+
+
+def two_opt(tour, neighbours, distance_matrix):
+    """
+    One 2-opt run with don't-look bits on tour (modified in place), the same moves as LocalSearch._two_opt in the same
+    order. neighbours is (n_cities, k) array of candidate lists. Returns the total gain.
+    """
+    n = len(tour)
+    if n < 4:
+        return 0.0
+    position = np.empty(n, dtype=np.intp)
+    for idx in range(n):
+        position[tour[idx]] = idx
+
+    dont_look = np.zeros(n, dtype=np.bool_)
+    # stack of cities to check, the last pushed city is checked first
+    queue = np.empty(2 * n, dtype=np.intp)
+    queue[:n] = tour
+    size = n
+    total_gain = 0.0
+    while size > 0:
+        size -= 1
+        a = queue[size]
+        if dont_look[a]:
+            continue
+        dont_look[a] = True
+        for side in range(2):
+            direction = 1 - 2 * side
+            pos_a = position[a]
+            b = tour[(pos_a + direction) % n]
+            d_ab = float(distance_matrix[a, b])
+            improved = False
+            for idx in range(neighbours.shape[1]):
+                c = neighbours[a, idx]
+                d_ac = float(distance_matrix[a, c])
+                if d_ac >= d_ab:
+                    break
+                pos_c = position[c]
+                d = tour[(pos_c + direction) % n]
+                if d == a or c == b:
+                    continue
+                gain = d_ab + float(distance_matrix[c, d]) - d_ac - float(distance_matrix[b, d])
+                if gain > 1e-9:
+                    if direction == 1:
+                        i, j = (pos_a + 1) % n, pos_c
+                    else:
+                        i, j = pos_c, (pos_a - 1) % n
+                    # the shorter of the inner and outer part is reversed, both give the same cycle
+                    length = (j - i) % n + 1
+                    if 2 * length > n:
+                        i, j = (j + 1) % n, (i - 1) % n
+                        length = n - length
+                    for _ in range(length // 2):
+                        city = tour[i]
+                        tour[i] = tour[j]
+                        tour[j] = city
+                        position[tour[i]] = i
+                        position[tour[j]] = j
+                        i = (i + 1) % n
+                        j = (j - 1) % n
+                    total_gain += gain
+
+                    if size + 4 > len(queue):
+                        grown = np.empty(2 * len(queue), dtype=np.intp)
+                        grown[:size] = queue[:size]
+                        queue = grown
+                    dont_look[a] = dont_look[b] = dont_look[c] = dont_look[d] = False
+                    queue[size], queue[size + 1], queue[size + 2], queue[size + 3] = a, b, c, d
+                    size += 4
+                    improved = True
+                    break
+            if improved:
+                break
+    return total_gain
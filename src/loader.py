@@ -0,0 +1,88 @@
+"""
+Loading of places (names and coordinates) from csv files or from pre-converted binary datasets. Only the place, lat and
+lng columns of csv are parsed with fixed dtypes and the selection of places is applied during the read. Binary dataset
+is a directory with coords.npy (float64 latitudes and longitudes) and places.npy (names), both are memory mapped.
+"""
+import os
+import numpy as np
+
+COLUMNS = ["place", "lat", "lng"]
+# place names are nearly unique, so str is parsed faster than categorical
+DTYPES = {"place": str, "lat": np.float64, "lng": np.float64}
+BINARY_FILES = ("coords.npy", "places.npy")
+CHUNK_SIZE = 2 ** 16
+
+
+def is_binary(path):
+    return os.path.isdir(path)
+
+
+def read_csv(path, columns=COLUMNS, **kwargs):
+    """
+    Reads given columns of csv. pandas is imported only here, loading of binary datasets does not need it.
+    """
+    import pandas as pd
+    # no missing values are detected, place names like "None" are names
+    return pd.read_csv(path, usecols=columns, dtype={column: DTYPES[column] for column in columns}, na_filter=False,
+                       **kwargs)
+
+
+def sample_rows(total, number_of_rows, rng):
+    """
+    Random rows drawn the same way as by DataFrame.sample, so csv and binary datasets give the same places for the same
+    generator state.
+    """
+    return np.random.default_rng(rng).choice(total, number_of_rows, replace=False)
+
+
+def load_places(path, number_of_rows=None, random_pick=False, selected_places=None, rng=None):
+    """
+    Returns (places, coords) of csv file or binary dataset directory. If selected_places are given, only these places
+    are loaded (in the order of the dataset), otherwise first number_of_rows places or random number_of_rows places (in
+    the order they were drawn) if random_pick is set. All places are loaded if number_of_rows is None.
+    """
+    if is_binary(path):
+        return _load_binary(path, number_of_rows, random_pick, selected_places, rng)
+    return _load_csv(path, number_of_rows, random_pick, selected_places, rng)
+
+
+def _load_csv(path, number_of_rows, random_pick, selected_places, rng):
+    if selected_places is not None:
+        # places are filtered chunk by chunk, only the selected rows are kept in memory
+        import pandas as pd
+        selected = set(selected_places)
+        chunks = [chunk[chunk["place"].isin(selected)] for chunk in read_csv(path, chunksize=CHUNK_SIZE)]
+        df = pd.concat(chunks, ignore_index=True)
+    elif number_of_rows is None:
+        df = read_csv(path)
+    elif not random_pick:
+        df = read_csv(path, nrows=number_of_rows)
+    else:
+        # the number of rows is not known before the read, skipping rows would need one more pass over the file
+        df = read_csv(path)
+        df = df.iloc[sample_rows(len(df), number_of_rows, rng)]
+    return df["place"].tolist(), df[["lat", "lng"]].to_numpy(dtype=np.float64)
+
+
+def _load_binary(path, number_of_rows, random_pick, selected_places, rng):
+    coords = np.load(os.path.join(path, "coords.npy"), mmap_mode="r")
+    places = np.load(os.path.join(path, "places.npy"), mmap_mode="r")
+    if selected_places is not None:
+        rows = np.flatnonzero(np.isin(places, list(selected_places)))
+    elif number_of_rows is None:
+        return places.tolist(), coords
+    elif not random_pick:
+        rows = np.arange(min(number_of_rows, len(places)))
+    else:
+        rows = sample_rows(len(places), number_of_rows, rng)
+    return places[rows].tolist(), np.asarray(coords[rows], dtype=np.float64)
+
+
+def convert(csv_path, directory):
+    """
+    Converts csv dataset to binary dataset directory.
+    """
+    df = read_csv(csv_path)
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, "coords.npy"), df[["lat", "lng"]].to_numpy(dtype=np.float64))
+    np.save(os.path.join(directory, "places.npy"), np.asarray(df["place"].astype(str).tolist(), dtype=str))
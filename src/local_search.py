@@ -0,0 +1,224 @@
+import numpy as np
+
+
+def neighbour_lists(distance_matrix, k, block_size=512):
+    """
+    Computes k nearest neighbours of every city (candidate lists), sorted by distance. Rows are processed in blocks
+    using argpartition, so the cost is O(n^2) time, but only O(n * k) memory for the result. Sparse distance matrix
+    provides its stored neighbours.
+    """
+    if hasattr(distance_matrix, "neighbours"):
+        return distance_matrix.neighbours(k)
+    n_cities = len(distance_matrix)
+    k = max(min(k, n_cities - 1), 0)
+    neighbours = np.empty((n_cities, k), dtype=np.intp)
+    if k == 0:
+        return neighbours
+    for start in range(0, n_cities, block_size):
+        end = min(start + block_size, n_cities)
+        block = np.array(distance_matrix[start:end], dtype=np.float64)
+        block[np.arange(end - start), np.arange(start, end)] = np.inf
+        nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(block, nearest, axis=1), axis=1, kind="stable")
+        neighbours[start:end] = np.take_along_axis(nearest, order, axis=1)
+    return neighbours
+
+
+class LocalSearch:
+    """
+    Memetic stage of the genetic algorithm. Routes are improved by 2-opt and Or-opt moves. Only the moves connecting a
+    city with one of its k nearest neighbours are tried and don't-look bits skip the cities whose surroundings have not
+    changed since they were checked, so one pass is near-linear in the number of cities. 2-opt can be run by a kernel
+    (see backends) instead of the reference implementation.
+    """
+    def __init__(self, distance_matrix, neighbours=8, max_passes=10, or_opt=True, max_segment=3, two_opt=None):
+        self.distance_matrix = distance_matrix
+        self.neighbour_array = neighbour_lists(distance_matrix, neighbours)
+        self.neighbours = self.neighbour_array.tolist()
+        self.two_opt_kernel = two_opt
+        self.max_passes = max_passes
+        self.or_opt = or_opt
+        self.max_segment = max_segment
+
+    def improve(self, route):
+        """
+        Improves route by alternating 2-opt and Or-opt until no improving move is found (or max_passes is reached).
+        Returns the improved route (new int32 array) and the total gain in km.
+        """
+        tour = [int(city) for city in route]
+        total_gain = 0.0
+        for _ in range(self.max_passes):
+            if self.two_opt_kernel is not None:
+                array = np.array(tour, dtype=np.int32)
+                gain = self.two_opt_kernel(array, self.neighbour_array, self.distance_matrix)
+                tour = array.tolist()
+            else:
+                gain = self._two_opt(tour)
+            if self.or_opt:
+                gain += self._or_opt(tour)
+            total_gain += gain
+            if gain <= 1e-9:
+                break
+        return np.array(tour, dtype=np.int32), total_gain
+
+    def _two_opt(self, tour):
+        """
+        One 2-opt run with don't-look bits. For city a and its tour neighbour b, the edge (a, b) is replaced by (a, c)
+        for candidate c closer to a than b, the second removed edge (c, d) is given by the move direction.
+        """
+        dist = self.distance_matrix.item
+        n = len(tour)
+        if n < 4:
+            return 0.0
+        position = [0] * n
+        for idx, city in enumerate(tour):
+            position[city] = idx
+
+        dont_look = [False] * n
+        queue = list(tour)
+        total_gain = 0.0
+        while queue:
+            a = queue.pop()
+            if dont_look[a]:
+                continue
+            dont_look[a] = True
+            improved = False
+            for direction in (1, -1):
+                pos_a = position[a]
+                b = tour[(pos_a + direction) % n]
+                d_ab = dist(a, b)
+                for c in self.neighbours[a]:
+                    d_ac = dist(a, c)
+                    if d_ac >= d_ab:
+                        break
+                    pos_c = position[c]
+                    d = tour[(pos_c + direction) % n]
+                    if d == a or c == b:
+                        continue
+                    gain = d_ab + dist(c, d) - d_ac - dist(b, d)
+                    if gain > 1e-9:
+                        if direction == 1:
+                            self._reverse(tour, position, (pos_a + 1) % n, pos_c)
+                        else:
+                            self._reverse(tour, position, pos_c, (pos_a - 1) % n)
+                        total_gain += gain
+                        for city in (a, b, c, d):
+                            dont_look[city] = False
+                            queue.append(city)
+                        improved = True
+                        break
+                if improved:
+                    break
+        return total_gain
+
+    def _or_opt(self, tour):
+        """
+        One Or-opt run with don't-look bits. Segments of 1 to max_segment cities starting at city a are moved (possibly
+        reversed) between a candidate neighbour c and its successor.
+        """
+        dist = self.distance_matrix.item
+        n = len(tour)
+        if n < 5:
+            return 0.0
+        position = [0] * n
+        for idx, city in enumerate(tour):
+            position[city] = idx
+
+        dont_look = [False] * n
+        queue = list(tour)
+        total_gain = 0.0
+        while queue:
+            a = queue.pop()
+            if dont_look[a]:
+                continue
+            dont_look[a] = True
+            move = self._find_or_move(tour, position, a, dist)
+            if move is not None:
+                gain, length, c, reverse = move
+                touched = self._move_segment(tour, position, position[a], length, c, reverse)
+                total_gain += gain
+                for city in touched:
+                    dont_look[city] = False
+                    queue.append(city)
+        return total_gain
+
+    def _find_or_move(self, tour, position, a, dist):
+        """
+        Returns the first improving move of segment starting at city a as (gain, length, c, reverse), or None.
+        """
+        n = len(tour)
+        start = position[a]
+        prev = tour[(start - 1) % n]
+        for length in range(1, min(self.max_segment, n - 3) + 1):
+            first, last = a, tour[(start + length - 1) % n]
+            next_ = tour[(start + length) % n]
+            removal_gain = dist(prev, first) + dist(last, next_) - dist(prev, next_)
+            if removal_gain <= 1e-9:
+                continue
+            for end_city in (first, last):
+                for c in self.neighbours[end_city]:
+                    # c and its successor must not be inside of the segment, c must not be its predecessor
+                    offset = (position[c] - start) % n
+                    if offset < length or offset == n - 1:
+                        continue
+                    c_next = tour[(position[c] + 1) % n]
+                    d_c = dist(c, c_next)
+                    # segment inserted in the original direction or reversed between c and c_next
+                    forward = removal_gain - (dist(c, first) + dist(last, c_next) - d_c)
+                    backward = removal_gain - (dist(c, last) + dist(first, c_next) - d_c)
+                    if forward > 1e-9 or backward > 1e-9:
+                        return max(forward, backward), length, c, backward > forward
+        return None
+
+    @classmethod
+    def _move_segment(cls, tour, position, start, length, c, reverse):
+        """
+        Moves segment of length cities from position start behind city c by three reversals of paths: the segment
+        together with the path behind it up to c, that path back and the segment back (unless it is inserted reversed).
+        Every reversal is done in place on the shorter side of the tour. Returns cities with changed neighbours.
+        """
+        n = len(tour)
+        segment = [tour[(start + idx) % n] for idx in range(length)]
+        first, last = segment[0], segment[-1]
+        prev = tour[(start - 1) % n]
+        next_ = tour[(start + length) % n]
+        c_next = tour[(position[c] + 1) % n]
+
+        # prev, first..last, next_..c, c_next -> prev, c..next_, last..first, c_next
+        cls._reverse(tour, position, start, position[c])
+        # -> prev, next_..c, last..first, c_next
+        cls._reverse_path(tour, position, prev, c, next_)
+        if not reverse:
+            # -> prev, next_..c, first..last, c_next
+            cls._reverse_path(tour, position, c, last, first)
+        return [prev, next_, c, c_next] + segment
+
+    @classmethod
+    def _reverse_path(cls, tour, position, before, x, y):
+        """
+        Reverses the path from city x to city y, before is the tour neighbour of x outside of the path. The tour may be
+        in either direction after previous reversals.
+        """
+        n = len(tour)
+        if tour[(position[x] - 1) % n] == before:
+            cls._reverse(tour, position, position[x], position[y])
+        else:
+            cls._reverse(tour, position, position[y], position[x])
+
+    @staticmethod
+    def _reverse(tour, position, i, j):
+        """
+        Reverses tour between positions i and j (inclusive, wrapping around). The shorter of the inner and outer part
+        is reversed, both give the same cycle.
+        """
+        n = len(tour)
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            length = n - length
+        for _ in range(length // 2):
+            tour[i], tour[j] = tour[j], tour[i]
+            position[tour[i]] = i
+            position[tour[j]] = j
+            i = (i + 1) % n
+            j = (j - 1) % n
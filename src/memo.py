@@ -0,0 +1,93 @@
+"""
+Canonical hashing of routes and bounded memo of their fitness. A closed tour can be written from any starting city in
+both directions, the canonical form starts with city 0 and continues to its smaller neighbour, so all 2n notations of
+one tour have the same hash. Directed hashes (objectives depending on direction of routes) keep the direction.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+# odd multiplier and shift of the final avalanche (splitmix64)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+_coefficients = {}
+
+
+def canonical_routes(routes, directed=False):
+    """
+    Rotates every route of (count, n_cities) array to start with city 0 and, unless directed, reverses it if the last
+    city is smaller than the second one.
+    """
+    routes = np.asarray(routes)
+    n_cities = routes.shape[1]
+    start = np.argmin(routes, axis=1)
+    rotated = np.take_along_axis(routes, (start[:, None] + np.arange(n_cities)) % n_cities, axis=1)
+    if directed or n_cities <= 2:
+        return rotated
+    reverse = rotated[:, -1] < rotated[:, 1]
+    rotated[reverse, 1:] = rotated[reverse, :0:-1]
+    return rotated
+
+
+def route_hashes(routes, directed=False):
+    """
+    64-bit hashes of canonical forms of routes, random odd coefficient for every position (fixed for the number of
+    cities) followed by splitmix64 finalizer.
+    """
+    canonical = canonical_routes(routes, directed).astype(np.uint64)
+    n_cities = canonical.shape[1]
+    if n_cities not in _coefficients:
+        rng = np.random.default_rng(n_cities)
+        _coefficients[n_cities] = rng.integers(0, 2 ** 63, n_cities, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    h = ((canonical + np.uint64(1)) * _coefficients[n_cities]).sum(axis=1, dtype=np.uint64)
+    h ^= h >> np.uint64(30)
+    h *= _MIX1
+    h ^= h >> np.uint64(27)
+    h *= _MIX2
+    h ^= h >> np.uint64(31)
+    return h
+
+
+class FitnessMemo:
+    """
+    Bounded memo of fitness (or width objectives) of already evaluated routes keyed by route hash. When max_size is
+    exceeded, the least recently used entries are dropped.
+    """
+    def __init__(self, max_size=100000, width=None):
+        self.max_size = max_size
+        self.width = width
+        self._fitness = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._fitness)
+
+    def lookup(self, hashes):
+        """
+        Returns memoized fitness of given hashes ((count, width) objectives if width is set), NaN for unknown routes.
+        """
+        fitness = np.full(len(hashes) if self.width is None else (len(hashes), self.width), np.nan)
+        hits = 0
+        for idx, key in enumerate(hashes.tolist()):
+            value = self._fitness.get(key)
+            if value is not None:
+                self._fitness.move_to_end(key)
+                fitness[idx] = value
+                hits += 1
+        self.hits += hits
+        self.misses += len(hashes) - hits
+        return fitness
+
+    def store(self, hashes, fitness):
+        for key, value in zip(hashes.tolist(), fitness.tolist()):
+            self._fitness[key] = value if self.width is None else tuple(value)
+            self._fitness.move_to_end(key)
+        while len(self._fitness) > self.max_size:
+            self._fitness.popitem(last=False)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
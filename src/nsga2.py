@@ -0,0 +1,69 @@
+"""
+NSGA-II non-dominated sorting and crowding distance over (count, n_objectives) arrays of objectives (minimized).
+"""
+import numpy as np
+
+
+def non_dominated_ranks(values, block_size=1024):
+    """
+    Returns front of every row (0 is the non-dominated front). The number of rows dominating each row is counted from
+    the (count, count) domination matrix built in blocks of rows, fronts are then peeled one by one by subtracting rows
+    of the current front, O(M N^2) in total.
+    """
+    count = len(values)
+    dominates = np.empty((count, count), dtype=bool)
+    for start in range(0, count, block_size):
+        block = values[start:start + block_size]
+        # comparisons are accumulated objective by objective, no (block, count, n_objectives) temporaries
+        not_worse = np.ones((len(block), count), dtype=bool)
+        better = np.zeros((len(block), count), dtype=bool)
+        for objective in range(values.shape[1]):
+            not_worse &= block[:, objective, None] <= values[None, :, objective]
+            better |= block[:, objective, None] < values[None, :, objective]
+        dominates[start:start + block_size] = not_worse & better
+
+    dominated_by = dominates.sum(axis=0, dtype=np.intp)
+    ranks = np.full(count, -1)
+    front = np.flatnonzero(dominated_by == 0)
+    rank = 0
+    while len(front):
+        ranks[front] = rank
+        dominated_by[front] = -1
+        dominated_by -= dominates[front].sum(axis=0, dtype=np.intp)
+        front = np.flatnonzero(dominated_by == 0)
+        rank += 1
+    return ranks
+
+
+def crowding_distance(values, ranks):
+    """
+    Crowding distance of every row within its front, sum over objectives of the normalized distance between the
+    neighbours of the row. Boundary rows of every front have infinite distance.
+    """
+    count = len(values)
+    distance = np.zeros(count)
+    for objective in values.T:
+        order = np.lexsort((objective, ranks))
+        sorted_values, sorted_ranks = objective[order], ranks[order]
+        first = np.r_[True, sorted_ranks[1:] != sorted_ranks[:-1]]
+        last = np.r_[sorted_ranks[1:] != sorted_ranks[:-1], True]
+        # range of objective in the front of every row
+        starts, ends = np.flatnonzero(first), np.flatnonzero(last)
+        front_range = np.repeat(sorted_values[ends] - sorted_values[starts], ends - starts + 1)
+
+        inner = ~(first | last)
+        gap = np.zeros(count)
+        gap[1:-1] = sorted_values[2:] - sorted_values[:-2]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            contribution = np.where(inner & (front_range > 0), gap / front_range, 0.0)
+        contribution[first | last] = np.inf
+        distance[order] += contribution
+    return distance
+
+
+def nsga2_order(values, fitness):
+    """
+    Order of rows by crowded comparison: ascending front, descending crowding distance, ties are broken by fitness.
+    """
+    ranks = non_dominated_ranks(values)
+    return np.lexsort((fitness, -crowding_distance(values, ranks), ranks))
@@ -0,0 +1,127 @@
+"""
+Vectorized evaluation of several objectives of routes over the shared distance matrix. Lengths of all edges of a chunk
+of routes are gathered once and every objective is computed from them, so adding objectives does not add passes over
+the route arrays.
+"""
+import numpy as np
+from .population import tour_lengths
+
+OBJECTIVES = ("distance", "time", "time_windows")
+
+
+class Objectives:
+    """
+    Objective engine evaluating given objectives of (count, n_cities) array of routes at once:
+    * distance - length of the closed tour in km,
+    * time - travel time in hours at speed (km/h) multiplied by speed factors of edges, plus service_time at every
+      visited place,
+    * time_windows - penalty in hours of arrivals outside of time windows of places ([open, close] hours after the
+      departure from depot). Waiting is not modelled, early arrivals are penalized as well as late ones, so arrival
+      times are a plain cumulative sum over the route rotated to start at depot.
+    Speed factors are either (n,) factors of places (factor of an edge is the mean of its end places) or (n, n) factors
+    of edges. Fitness is the weighted sum of objectives.
+    """
+    def __init__(self, distance_matrix, names=("distance",), weights=None, speed=60.0, speed_factors=None,
+                 service_time=0.0, time_windows=None, depot=0, chunk_size=1024):
+        unknown = set(names) - set(OBJECTIVES)
+        if unknown or not len(names):
+            raise Exception("Unknown objective type.")
+        if "time_windows" in names and time_windows is None:
+            raise Exception("Time windows objective requires time windows of places.")
+        self.distance_matrix = distance_matrix
+        self.names = list(names)
+        self.weights = np.ones(len(names)) if weights is None else np.asarray(weights, dtype=np.float64)
+        if len(self.weights) != len(self.names):
+            raise Exception("Number of weights must be equal to number of objectives.")
+        self.speed = speed
+        self.speed_factors = None if speed_factors is None else np.asarray(speed_factors, dtype=np.float64)
+        self.service_time = service_time
+        self.time_windows = None if time_windows is None else np.asarray(time_windows, dtype=np.float64)
+        self.depot = depot
+        self.chunk_size = chunk_size
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_config(cls, dataset, config):
+        """
+        Creates objectives from config with place names: speed_factors and time_windows map places to their factor or
+        [open, close] window (other places have factor 1 and no window), depot is the name of the first place of
+        routes (the first place of dataset by default).
+        """
+        n_cities = len(dataset)
+        speed_factors = None
+        if config.get("speed_factors"):
+            speed_factors = np.ones(n_cities)
+            for place, factor in config["speed_factors"].items():
+                speed_factors[dataset.place_index[place]] = factor
+        time_windows = None
+        if config.get("time_windows"):
+            time_windows = np.tile([-np.inf, np.inf], (n_cities, 1))
+            for place, window in config["time_windows"].items():
+                time_windows[dataset.place_index[place]] = window
+        depot = dataset.place_index[config["depot"]] if config.get("depot") is not None else 0
+        return cls(dataset.distance_matrix, config["names"], config.get("weights"), config["speed"], speed_factors,
+                   config["service_time"], time_windows, depot)
+
+    @property
+    def symmetric(self):
+        """
+        True if objectives of a route do not depend on its direction (reversed routes may share memoized values).
+        """
+        if "time_windows" in self.names:
+            return False
+        factors = self.speed_factors
+        return factors is None or factors.ndim == 1 or bool(np.array_equal(factors, factors.T))
+
+    def evaluate(self, routes):
+        """
+        Returns (count, n_objectives) array of objectives of routes, routes are processed in chunks.
+        """
+        values = np.empty((len(routes), len(self.names)))
+        for start in range(0, len(routes), self.chunk_size):
+            values[start:start + self.chunk_size] = self._evaluate_chunk(routes[start:start + self.chunk_size])
+        return values
+
+    def fitness(self, values):
+        return values @ self.weights
+
+    def _evaluate_chunk(self, routes):
+        if "time_windows" in self.names:
+            # arrival times are counted from depot
+            start = np.argmax(routes == self.depot, axis=1)
+            n_cities = routes.shape[1]
+            routes = np.take_along_axis(routes, (start[:, None] + np.arange(n_cities)) % n_cities, axis=1)
+        from_ = routes
+        to = np.roll(routes, -1, axis=1)
+        if isinstance(self.distance_matrix, np.ndarray):
+            edges = np.take(self.distance_matrix.ravel(), from_.astype(np.intp) * len(self.distance_matrix) + to)
+        else:
+            edges = self.distance_matrix[from_, to]
+
+        values = np.empty((len(routes), len(self.names)))
+        travel = None
+        for column, name in enumerate(self.names):
+            if name == "distance":
+                values[:, column] = tour_lengths(edges)
+                continue
+            if travel is None:
+                travel = edges / (self.speed * self._edge_factors(from_, to))
+            if name == "time":
+                values[:, column] = travel.sum(axis=1) + self.service_time * (routes.shape[1] - 1)
+            else:
+                # arrival at i-th visited place, the return to depot is not constrained
+                arrival = np.cumsum(travel[:, :-1], axis=1) + self.service_time * np.arange(routes.shape[1] - 1)
+                windows = self.time_windows[routes[:, 1:]]
+                early = np.maximum(windows[..., 0] - arrival, 0)
+                late = np.maximum(arrival - windows[..., 1], 0)
+                values[:, column] = (early + late).sum(axis=1)
+        return values
+
+    def _edge_factors(self, from_, to):
+        if self.speed_factors is None:
+            return 1.0
+        if self.speed_factors.ndim == 1:
+            return (self.speed_factors[from_] + self.speed_factors[to]) / 2
+        return self.speed_factors[from_, to]
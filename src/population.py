@@ -0,0 +1,205 @@
+import numpy as np
+from .individual import Individual
+
+
+def tour_lengths(edges):
+    """
+    Sums the rows of (count, n_cities) array of edge lengths, adding edges one after another in float64 like the tour
+    length kernel. NumPy sums a contiguous axis pairwise, so the rows are summed over the transposed copy (a single row
+    is summed by cumulative sum, as its transposed copy is summed pairwise too).
+    """
+    if len(edges) == 1:
+        return np.cumsum(edges, axis=1, dtype=np.float64)[:, -1]
+    return np.ascontiguousarray(edges.T, dtype=np.float64).sum(axis=0)
+
+
+class Population:
+    """
+    Class storing the entire population as one (pop_size, n_cities) int32 array of routes and one float array of
+    fitness values. Row i of routes is the chromosome of i-th individual. Individual objects are not stored, they are
+    created only on demand as thin views over one row (e.g. for plotting of the best route). Multi-objective population
+    also stores (pop_size, n_objectives) array of objectives, fitness is then their weighted sum.
+    """
+    def __init__(self, routes, fitness=None, objectives=None):
+        self.routes = np.ascontiguousarray(routes, dtype=np.int32)
+        if fitness is None:
+            fitness = np.full(len(self.routes), np.nan)
+        self.fitness = fitness
+        self.objectives = objectives
+
+    def __len__(self):
+        return len(self.routes)
+
+    @property
+    def n_cities(self):
+        return self.routes.shape[1]
+
+    @staticmethod
+    def random_routes(count, n_cities, rng=None):
+        """
+        Creates count random permutations of n_cities at once.
+        """
+        rng = np.random.default_rng(rng)
+        return rng.permuted(np.tile(np.arange(n_cities, dtype=np.int32), (count, 1)), axis=1)
+
+    @classmethod
+    def random(cls, pop_size, n_cities, rng=None):
+        return cls(cls.random_routes(pop_size, n_cities, rng))
+
+    def invalid(self):
+        """
+        Returns indices of routes without valid cached fitness (new or changed routes).
+        """
+        return np.flatnonzero(np.isnan(self.fitness))
+
+    def evaluate(self, distance_matrix, rows=None):
+        """
+        Computes the distance of given routes (all by default), one route at a time.
+        """
+        rows = np.arange(len(self.routes)) if rows is None else rows
+        for idx in rows:
+            route = self.routes[idx]
+            self.fitness[idx] = tour_lengths(distance_matrix[route, np.roll(route, -1)][None])[0]
+
+    def evaluate_batched(self, distance_matrix, rows=None, chunk_size=1024):
+        """
+        Computes the distance of given routes (all by default) at once by one gather over flattened distance matrix
+        (edges from i-th to (i+1)-th column of routes). Rows are processed in chunks, so the temporary index arrays stay
+        bounded for big populations. Sparse distance matrix is indexed by the edges directly. Edges are added one after
+        another in float64 like by tour length kernel, so all backends give bitwise equal fitness.
+        """
+        rows = np.arange(len(self.routes)) if rows is None else rows
+        dense = isinstance(distance_matrix, np.ndarray)
+        flat = distance_matrix.ravel() if dense else None
+        n_cities = distance_matrix.shape[1]
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            routes = self.routes[chunk]
+            if dense:
+                edges = routes.astype(np.intp) * n_cities + np.roll(routes, -1, axis=1)
+                self.fitness[chunk] = tour_lengths(np.take(flat, edges))
+            else:
+                self.fitness[chunk] = tour_lengths(distance_matrix[routes, np.roll(routes, -1, axis=1)])
+
+    def top(self, k):
+        """
+        Returns indices of k best routes in ascending order of fitness, without sorting the whole population.
+        """
+        k = min(k, len(self.fitness))
+        if k < len(self.fitness):
+            best = np.argpartition(self.fitness, k - 1)[:k]
+        else:
+            best = np.arange(k)
+        return best[np.argsort(self.fitness[best], kind="stable")]
+
+    def diversity(self):
+        """
+        Edge diversity of population, 1 - mean fraction of edges (in any direction) shared by a route with the first
+        (best) route. 0 means that all routes are the same tour.
+        """
+        best = self.routes[0]
+        successor = np.empty(self.n_cities, dtype=self.routes.dtype)
+        successor[best] = np.roll(best, -1)
+        from_ = self.routes
+        to = np.roll(self.routes, -1, axis=1)
+        shared = (successor[from_] == to) | (successor[to] == from_)
+        return 1.0 - float(shared.mean())
+
+    def sort(self, order=None):
+        """
+        Sorts routes in ascending order of fitness (or in given order of rows), so the best individual is always in the
+        first row.
+        """
+        if order is None:
+            order = np.argsort(self.fitness, kind="stable")
+        self.routes = self.routes[order]
+        self.fitness = self.fitness[order]
+        if self.objectives is not None:
+            self.objectives = self.objectives[order]
+
+    def mutate(self, rows, mutation_prob, mutation_gene_change_percent, distance_matrix=None, rng=None, kernel=None):
+        """
+        Random multiple point mutation of given rows, equivalent to Individual.mutate applied to each of them. The loop
+        runs over mutated gene positions only, all rows are swapped at once. If distance matrix is provided, cached
+        fitness of mutated rows is updated in O(1) per swap from the affected edges, otherwise it is invalidated.
+        If swap mutation kernel is given (see backends), the swaps are done by the kernel. Returns indices of rows which
+        were changed.
+        """
+        rng = np.random.default_rng(rng)
+        rows = np.asarray(rows)
+        n_cities = self.n_cities
+        changed = np.zeros(len(self.routes), dtype=bool)
+        len_ = round(n_cities * mutation_gene_change_percent)
+        if kernel is not None:
+            return self._mutate_kernel(kernel, rows, mutation_prob, len_, distance_matrix, rng)
+        for idx in range(len_):
+            # check if the probability of mutation is satisfied
+            mutated = rng.uniform(0, 1, len(rows)) <= mutation_prob
+            # save index in chromosome for mutation
+            swap_idx = (rng.random(len(rows)) * n_cities).astype(np.intp)
+
+            mutated &= swap_idx != idx
+            selected = rows[mutated]
+            swap_idx = swap_idx[mutated]
+            if distance_matrix is not None:
+                starts, weights = self._swap_edges(idx, swap_idx)
+                before = self._edges_length(selected, starts, weights, distance_matrix)
+
+            country1 = self.routes[selected, idx]
+            self.routes[selected, idx] = self.routes[selected, swap_idx]
+            self.routes[selected, swap_idx] = country1
+            changed[selected] = True
+
+            if distance_matrix is not None:
+                self.fitness[selected] += self._edges_length(selected, starts, weights, distance_matrix) - before
+
+        changed = np.flatnonzero(changed)
+        if distance_matrix is None:
+            self.fitness[changed] = np.nan
+        return changed
+
+    def _mutate_kernel(self, kernel, rows, mutation_prob, len_, distance_matrix, rng):
+        """
+        Mutation by kernel. Random numbers are drawn in the same order as by mutate, so both give the same routes.
+        """
+        mutated = np.empty((len_, len(rows)), dtype=bool)
+        swap_idx = np.empty((len_, len(rows)), dtype=np.intp)
+        for idx in range(len_):
+            mutated[idx] = rng.uniform(0, 1, len(rows)) <= mutation_prob
+            swap_idx[idx] = (rng.random(len(rows)) * self.n_cities).astype(np.intp)
+
+        changed = np.zeros(len(self.routes), dtype=bool)
+        delta = distance_matrix is not None
+        kernel(self.routes, rows.astype(np.intp), mutated, swap_idx, self.fitness,
+               distance_matrix if delta else np.empty((0, 0)), delta, changed)
+        changed = np.flatnonzero(changed)
+        if not delta:
+            self.fitness[changed] = np.nan
+        return changed
+
+    def _swap_edges(self, idx, swap_idx):
+        """
+        Start positions of edges affected by swap of genes idx and swap_idx (edges entering and leaving both positions)
+        with weights, which remove edges counted twice when the swapped genes are neighbours.
+        """
+        n_cities = self.n_cities
+        idx = np.full(len(swap_idx), idx)
+        starts = np.stack(((idx - 1) % n_cities, idx, (swap_idx - 1) % n_cities, swap_idx), axis=1)
+        weights = np.ones(starts.shape)
+        weights[:, 2] = (starts[:, 2] != starts[:, 0]) & (starts[:, 2] != starts[:, 1])
+        weights[:, 3] = (starts[:, 3] != starts[:, 0]) & (starts[:, 3] != starts[:, 1])
+        return starts, weights
+
+    def _edges_length(self, rows, starts, weights, distance_matrix):
+        from_ = self.routes[rows[:, None], starts]
+        to = self.routes[rows[:, None], (starts + 1) % self.n_cities]
+        return (distance_matrix[from_, to] * weights).sum(axis=1)
+
+    def individual(self, idx, dataset, mut_prob=0.0, mutation_gene_change_percent=0.0, rng=None):
+        """
+        Returns Individual view of idx-th route. The chromosome is a copy, so the view stays valid when the population
+        is recreated.
+        """
+        individual = Individual(dataset, mut_prob, mutation_gene_change_percent, rng)
+        individual.set_chromosome(self.routes[idx].copy())
+        return individual
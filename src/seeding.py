@@ -0,0 +1,263 @@
+"""
+Seeding of the initial population by construction heuristics: nearest-neighbour, greedy-edge and space-filling-curve
+tours. Places are converted to 3-D unit vectors, so the chord distance used by the spatial index is monotone in the
+great-circle distance and neighbours are correct across the antimeridian and near the poles.
+"""
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+SEEDING_METHODS = ("nearest_neighbour", "greedy", "space_filling_curve")
+
+
+def unit_vectors(coords):
+    """
+    Converts (n, 2) array of latitudes and longitudes in degrees to (n, 3) array of unit vectors.
+    """
+    lat, lng = np.radians(coords[:, 0]), np.radians(coords[:, 1])
+    return np.column_stack((np.cos(lat) * np.cos(lng), np.cos(lat) * np.sin(lng), np.sin(lat)))
+
+
+def hilbert_index(points, bits=21):
+    """
+    Index of every point of (n, 3) array in [-1, 1]^3 on 3-D Hilbert curve of 2^bits cells per axis (Skilling's
+    transposition algorithm, vectorized over points).
+    """
+    grid = np.rint((np.clip(points, -1, 1) + 1) / 2 * ((1 << bits) - 1)).astype(np.uint64)
+    x = [grid[:, axis].copy() for axis in range(3)]
+
+    q = 1 << (bits - 1)
+    while q > 1:
+        p = np.uint64(q - 1)
+        for axis in range(3):
+            high = (x[axis] & np.uint64(q)) != 0
+            # invert low bits of the first axis, or exchange low bits of the first and this axis
+            t = np.where(high, np.uint64(0), (x[0] ^ x[axis]) & p)
+            x[0] ^= np.where(high, p, t)
+            x[axis] ^= t
+        q >>= 1
+
+    # gray encode
+    for axis in range(1, 3):
+        x[axis] ^= x[axis - 1]
+    t = np.zeros(len(points), dtype=np.uint64)
+    q = 1 << (bits - 1)
+    while q > 1:
+        t ^= np.where((x[2] & np.uint64(q)) != 0, np.uint64(q - 1), np.uint64(0))
+        q >>= 1
+    for axis in range(3):
+        x[axis] ^= t
+
+    # interleave bits of the transposed coordinates
+    index = np.zeros(len(points), dtype=np.uint64)
+    for bit in range(bits - 1, -1, -1):
+        for axis in range(3):
+            index = (index << np.uint64(1)) | ((x[axis] >> np.uint64(bit)) & np.uint64(1))
+    return index
+
+
+def random_rotation(rng):
+    """
+    Uniformly random 3-D rotation matrix.
+    """
+    q, r = np.linalg.qr(rng.normal(size=(3, 3)))
+    q *= np.sign(np.diag(r))
+    if np.linalg.det(q) < 0:
+        q[:, 0] = -q[:, 0]
+    return q
+
+
+class SpatialIndex:
+    """
+    k nearest neighbour queries over places represented as 3-D unit vectors. KD-tree of scipy is used if it is
+    installed (O(n log n)), otherwise the points are compared blockwise by brute force (O(n^2) time, but only
+    O(block_size * n) memory).
+    """
+    def __init__(self, coords, block_size=512):
+        self.points = unit_vectors(np.asarray(coords, dtype=np.float64))
+        self.tree = cKDTree(self.points) if cKDTree is not None else None
+        self.block_size = block_size
+
+    def __len__(self):
+        return len(self.points)
+
+    def query(self, k):
+        """
+        Returns (n, k) arrays of neighbour indices of every place (without the place itself) and their chord distances,
+        sorted by distance.
+        """
+        n = len(self.points)
+        k = max(min(k, n - 1), 0)
+        if k == 0:
+            return np.empty((n, 0), dtype=np.intp), np.empty((n, 0))
+
+        if self.tree is not None:
+            distances, neighbours = self.tree.query(self.points, k + 1)
+            # the place itself is usually the first neighbour, but places with equal coordinates come in any order
+            itself = neighbours == np.arange(n)[:, None]
+            itself[~itself.any(axis=1), -1] = True
+            return neighbours[~itself].reshape(n, k), distances[~itself].reshape(n, k)
+
+        neighbours = np.empty((n, k), dtype=np.intp)
+        distances = np.empty((n, k))
+        for start in range(0, n, self.block_size):
+            end = min(start + self.block_size, n)
+            squared = np.maximum(2 - 2 * self.points[start:end] @ self.points.T, 0)
+            squared[np.arange(end - start), np.arange(start, end)] = np.inf
+            nearest = np.argpartition(squared, k - 1, axis=1)[:, :k]
+            block = np.take_along_axis(squared, nearest, axis=1)
+            order = np.argsort(block, axis=1, kind="stable")
+            neighbours[start:end] = np.take_along_axis(nearest, order, axis=1)
+            distances[start:end] = np.sqrt(np.take_along_axis(block, order, axis=1))
+        return neighbours, distances
+
+    def nearest(self, point, candidates):
+        """
+        Returns the nearest of candidates (array of indices) to given point by brute force.
+        """
+        return candidates[np.argmax(self.points[candidates] @ self.points[point])]
+
+
+class Seeder:
+    """
+    Creates tours by construction heuristics. Candidate neighbours of all places are computed once by the spatial
+    index. Repeated tours differ by the random start city (nearest-neighbour), random noise of edge lengths (greedy) or
+    random rotation of the sphere (space-filling curve).
+    """
+    def __init__(self, coords, neighbours=10, noise=0.1):
+        self.index = SpatialIndex(coords)
+        self.neighbours, self.distances = self.index.query(neighbours)
+        self._neighbour_lists = self.neighbours.tolist()
+        self.noise = noise
+
+    def __len__(self):
+        return len(self.index)
+
+    def seed(self, count, methods=SEEDING_METHODS, rng=None):
+        """
+        Returns (count, n_cities) int32 array of tours, methods take turns. The first tour of greedy and
+        space-filling-curve methods is the deterministic one.
+        """
+        rng = np.random.default_rng(rng)
+        for method in methods:
+            if method not in SEEDING_METHODS:
+                raise Exception("Unknown seeding method.")
+        tours = np.empty((count, len(self)), dtype=np.int32)
+        for idx in range(count):
+            method = methods[idx % len(methods)]
+            first = idx < len(methods)
+            if method == "nearest_neighbour":
+                tours[idx] = self.nearest_neighbour(int(rng.integers(len(self))))
+            elif method == "greedy":
+                tours[idx] = self.greedy(None if first else rng)
+            else:
+                tours[idx] = self.space_filling_curve(None if first else random_rotation(rng))
+        return tours
+
+    def nearest_neighbour(self, start):
+        """
+        Nearest-neighbour tour from start city. The next city is the first unvisited candidate neighbour, only if all
+        candidates are visited the nearest unvisited city is searched by brute force.
+        """
+        n = len(self)
+        neighbours = self._neighbour_lists
+        visited = np.zeros(n, dtype=bool)
+        tour = np.empty(n, dtype=np.int32)
+        current = start
+        for idx in range(n):
+            tour[idx] = current
+            visited[current] = True
+            if idx == n - 1:
+                break
+            for city in neighbours[current]:
+                if not visited[city]:
+                    current = city
+                    break
+            else:
+                current = self.index.nearest(current, np.flatnonzero(~visited))
+        return tour
+
+    def greedy(self, rng=None):
+        """
+        Greedy-edge tour. Candidate edges are added from the shortest if both cities have degree less than 2 and no
+        cycle is closed, the resulting paths are joined by their nearest end points. If rng is given, lengths of edges
+        are randomly perturbed by noise.
+        """
+        n = len(self)
+        first = np.repeat(np.arange(n), self.neighbours.shape[1])
+        second = self.neighbours.ravel()
+        keys, unique = np.unique(np.minimum(first, second) * n + np.maximum(first, second), return_index=True)
+        lengths = self.distances.ravel()[unique]
+        if rng is not None:
+            lengths = lengths * (1 + self.noise * rng.random(len(lengths)))
+
+        parent = list(range(n))
+        degree = [0] * n
+        adjacency = [[] for _ in range(n)]
+
+        def find(city):
+            while parent[city] != city:
+                parent[city] = parent[parent[city]]
+                city = parent[city]
+            return city
+
+        for key in keys[np.argsort(lengths, kind="stable")].tolist():
+            a, b = divmod(key, n)
+            if degree[a] < 2 and degree[b] < 2:
+                root_a, root_b = find(a), find(b)
+                if root_a != root_b:
+                    parent[root_a] = root_b
+                    degree[a] += 1
+                    degree[b] += 1
+                    adjacency[a].append(b)
+                    adjacency[b].append(a)
+
+        # every component is a path, walk it from one of its end points
+        fragments = []
+        walked = [False] * n
+        for city in range(n):
+            if degree[city] < 2 and not walked[city]:
+                fragment = [city]
+                walked[city] = True
+                previous, current = -1, city
+                while True:
+                    following = [next_ for next_ in adjacency[current] if next_ != previous]
+                    if not following:
+                        break
+                    previous, current = current, following[0]
+                    fragment.append(current)
+                    walked[current] = True
+                fragments.append(fragment)
+        return self._join(fragments)
+
+    def _join(self, fragments):
+        """
+        Joins paths into one tour, the next path is the one with end point nearest to the tail of the tour.
+        """
+        ends = np.array([[fragment[0], fragment[-1]] for fragment in fragments])
+        used = np.zeros(len(fragments), dtype=bool)
+        used[0] = True
+        tour = list(fragments[0])
+        points = self.index.points
+        for _ in range(len(fragments) - 1):
+            candidates = np.flatnonzero(~used)
+            heads = points[ends[candidates, 0]] @ points[tour[-1]]
+            tails = points[ends[candidates, 1]] @ points[tour[-1]]
+            head, tail = np.argmax(heads), np.argmax(tails)
+            if heads[head] >= tails[tail]:
+                used[candidates[head]] = True
+                tour.extend(fragments[candidates[head]])
+            else:
+                used[candidates[tail]] = True
+                tour.extend(reversed(fragments[candidates[tail]]))
+        return np.array(tour, dtype=np.int32)
+
+    def space_filling_curve(self, rotation=None):
+        """
+        Tour visiting places in the order of 3-D Hilbert curve over their unit vectors (optionally rotated).
+        """
+        points = self.index.points if rotation is None else self.index.points @ rotation.T
+        return np.argsort(hilbert_index(points), kind="stable").astype(np.int32)
@@ -0,0 +1,24 @@
+from multiprocessing import shared_memory
+import numpy as np
+
+
+def share_array(array):
+    """
+    Copies numpy array to a new shared memory block. Returns the block (the owner has to close and unlink it) and
+    a small picklable spec, which is used by other processes to attach the array without copying it.
+    """
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    shared[...] = array
+    spec = {"name": shm.name, "shape": array.shape, "dtype": array.dtype.str}
+    return shm, spec
+
+
+def attach_array(spec):
+    """
+    Attaches the array shared by share_array in a child process (the child shares resource tracker with its parent,
+    so the block is unlinked only by the owner). The returned block has to be kept alive while the array is used.
+    """
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    array = np.ndarray(spec["shape"], dtype=np.dtype(spec["dtype"]), buffer=shm.buf)
+    return array, shm
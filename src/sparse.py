@@ -0,0 +1,125 @@
+import numpy as np
+from .seeding import SpatialIndex
+
+# multiplier of Fibonacci hashing of edge keys to cache slots
+_HASH = np.uint64(0x9E3779B97F4A7C15)
+
+
+class SparseDistanceMatrix:
+    """
+    Distance matrix for datasets too large for the dense N x N array. Only the distances between every place and its k
+    nearest neighbours (in both directions) are stored in CSR arrays (indptr, indices, data), the other distances are
+    computed on demand by distance function (haversine formula) from coordinates. Recently computed off-neighbour
+    distances are kept in a small direct-mapped cache, every edge has one slot (shared by both directions) and the
+    newest edge replaces the older one, so cache lookups stay vectorized.
+
+    Supports the indexing used by the GA as dense matrix does: D[a, b] for integers or broadcastable index arrays,
+    D[start:end] for blocks of rows, item(a, b), len and shape.
+    """
+    def __init__(self, coords, neighbours, distance, dtype=np.float64, cache_bits=16):
+        self.coords = np.asarray(coords, dtype=np.float64)
+        self.distance = distance
+        self.dtype = np.dtype(dtype)
+        n = len(self.coords)
+        self.shape = (n, n)
+
+        self.nearest, _ = SpatialIndex(self.coords).query(neighbours)
+        self.nearest = self.nearest.astype(np.int32)
+        rows = np.repeat(np.arange(n, dtype=np.int64), self.nearest.shape[1])
+        cols = self.nearest.ravel().astype(np.int64)
+        # keys row * n + col are sorted, so they give CSR order and allow binary search of stored edges
+        self._keys = np.unique(np.concatenate((rows * n + cols, cols * n + rows)))
+        rows, cols = np.divmod(self._keys, n)
+        self.indptr = np.searchsorted(rows, np.arange(n + 1))
+        self.indices = cols.astype(np.int32)
+        self.data = self._compute(rows, cols)
+
+        self._cache_shift = np.uint64(64 - cache_bits)
+        self._cache_keys = np.full(1 << cache_bits, -1, dtype=np.int64)
+        self._cache_values = np.zeros(1 << cache_bits, dtype=self.dtype)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __len__(self):
+        return self.shape[0]
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in (self.nearest, self._keys, self.indptr, self.indices, self.data,
+                                              self._cache_keys, self._cache_values))
+
+    def _compute(self, rows, cols):
+        lat, lng = self.coords[:, 0], self.coords[:, 1]
+        return np.asarray(self.distance(lat[rows], lng[rows], lat[cols], lng[cols]), dtype=self.dtype)
+
+    def _slots(self, edges):
+        return ((edges.astype(np.uint64) * _HASH) >> self._cache_shift).astype(np.intp)
+
+    def lookup(self, a, b):
+        """
+        Distances from places a to places b (broadcastable index arrays).
+        """
+        a, b = np.broadcast_arrays(np.asarray(a, dtype=np.int64), np.asarray(b, dtype=np.int64))
+        shape = a.shape
+        a, b = a.ravel(), b.ravel()
+        n = self.shape[0]
+
+        keys = a * n + b
+        position = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        stored = self._keys[position] == keys
+        result = np.empty(len(keys), dtype=self.dtype)
+        result[stored] = self.data[position[stored]]
+
+        missing = np.flatnonzero(~stored)
+        if len(missing):
+            low, high = np.minimum(a[missing], b[missing]), np.maximum(a[missing], b[missing])
+            edges = low * n + high
+            slots = self._slots(edges)
+            cached = self._cache_keys[slots] == edges
+            result[missing[cached]] = self._cache_values[slots[cached]]
+
+            computed = ~cached
+            values = self._compute(low[computed], high[computed])
+            result[missing[computed]] = values
+            self._cache_keys[slots[computed]] = edges[computed]
+            self._cache_values[slots[computed]] = values
+            self.cache_hits += int(cached.sum())
+            self.cache_misses += len(values)
+        return result.reshape(shape)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            # dense block of rows, distances to all places are computed
+            rows = np.arange(self.shape[0])[key]
+            return self._compute(rows[:, None], np.arange(self.shape[1])[None, :])
+        result = self.lookup(*key)
+        return result[()] if result.ndim == 0 else result
+
+    def item(self, a, b):
+        """
+        Distance from place a to place b as Python float.
+        """
+        a, b = int(a), int(b)
+        n = self.shape[0]
+        key = a * n + b
+        position = self._keys.searchsorted(key)
+        if position < len(self._keys) and self._keys[position] == key:
+            return float(self.data[position])
+
+        low, high = (a, b) if a < b else (b, a)
+        edge = low * n + high
+        slot = ((edge * int(_HASH)) & 0xFFFFFFFFFFFFFFFF) >> int(self._cache_shift)
+        if self._cache_keys[slot] == edge:
+            self.cache_hits += 1
+            return float(self._cache_values[slot])
+        value = self.dtype.type(self.distance(*self.coords[low], *self.coords[high]))
+        self._cache_keys[slot] = edge
+        self._cache_values[slot] = value
+        self.cache_misses += 1
+        return float(value)
+
+    def neighbours(self, k):
+        """
+        Candidate lists of k nearest neighbours of every place sorted by distance, at most the stored neighbours.
+        """
+        return self.nearest[:, :k].astype(np.intp)
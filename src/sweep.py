@@ -0,0 +1,36 @@
+import time
+import numpy as np
+from .convergence import Convergence
+from .dataset import Dataset
+from .evolution import evolve
+from .ga import GA
+from .shared import attach_array
+
+# distance matrices attached in this worker process, shared memory name -> (array, block)
+_attached = {}
+
+
+def run_task(task):
+    """
+    Executes one run of the sweep in worker process. The distance matrix of the run's dataset is attached from shared
+    memory once per process and reused by all runs of the same dataset, sparse distance matrix is received as a copy.
+    """
+    spec = task["matrix"]
+    if isinstance(spec, dict):
+        if spec["name"] not in _attached:
+            _attached[spec["name"]] = attach_array(spec)
+        distance_matrix = _attached[spec["name"]][0]
+    else:
+        distance_matrix = spec
+
+    dataset = Dataset.from_arrays(distance_matrix, task["coords"], task["countries"])
+    start = time.perf_counter()
+    ga = GA(dataset=dataset, rng=np.random.default_rng(task["seed"]), **task["ga_kwargs"])
+    convergence = Convergence(**task["convergence"]) if task["convergence"] else None
+    ga.init_population()
+    generations, _, best = evolve(ga, task["generations"], task["iter_stop"], convergence)
+    elapsed = time.perf_counter() - start
+
+    return {"run": task["run"], "best_distance": best[1], "generations": generations, "wall_s": round(elapsed, 4),
+            "generations_per_s": round(generations / elapsed, 2), "route": best[0].chromosome}
+
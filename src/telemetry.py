@@ -0,0 +1,98 @@
+import csv
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class Telemetry:
+    """
+    Instrumentation of the genetic algorithm. Every phase (fitness, selection, crossover, mutation, local search) is
+    measured by high resolution timer, callbacks registered for the phase are called before and after it and counters
+    count events like created children or cached fitness hits.
+
+    Callbacks are called as callback(phase, context, elapsed_ns), where context is the object running the phase (GA)
+    and elapsed_ns is None before the phase.
+    """
+    def __init__(self):
+        self.timings_ns = defaultdict(int)
+        self.calls = defaultdict(int)
+        self.counters = defaultdict(int)
+        self._callbacks = {"before": defaultdict(list), "after": defaultdict(list)}
+
+    def on(self, phase, callback, when="after"):
+        """
+        Registers callback called before or after every run of phase ("*" for all phases).
+        """
+        if when not in self._callbacks:
+            raise Exception("Callback can be registered only before or after phase.")
+        self._callbacks[when][phase].append(callback)
+
+    @contextmanager
+    def phase(self, name, context=None):
+        """
+        Context manager measuring one run of phase.
+        """
+        for callback in self._callbacks["before"][name] + self._callbacks["before"]["*"]:
+            callback(name, context, None)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            self.timings_ns[name] += elapsed
+            self.calls[name] += 1
+            for callback in self._callbacks["after"][name] + self._callbacks["after"]["*"]:
+                callback(name, context, elapsed)
+
+    def count(self, name, value=1):
+        self.counters[name] += int(value)
+
+    def timings(self):
+        """
+        Total time of every phase in seconds.
+        """
+        return {phase: elapsed / 1e9 for phase, elapsed in self.timings_ns.items()}
+
+    def summary(self):
+        return {"timings_s": self.timings(), "calls": dict(self.calls), "counters": dict(self.counters)}
+
+
+class GenerationWriter:
+    """
+    Exports per generation metrics (best and mean fitness, diversity, time of phases in the generation) to CSV or JSON
+    lines file, the format is chosen by the file extension (.csv, otherwise JSON lines). With append, rows are added to
+    the existing file (resumed run).
+    """
+    FIELDS = ["generation", "best", "mean", "diversity", "time_s"]
+
+    def __init__(self, path, telemetry=None, phases=("fitness", "selection", "crossover", "mutation"), append=False):
+        self.path = path
+        self.telemetry = telemetry
+        self.phases = list(phases) if telemetry is not None else []
+        self.csv = os.path.splitext(path)[1].lower() == ".csv"
+        exists = append and os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, "a" if append else "w", newline="")
+        self._writer = None
+        if self.csv:
+            self._writer = csv.DictWriter(self._file, fieldnames=self.FIELDS + [f"{p}_ms" for p in self.phases])
+            if not exists:
+                self._writer.writeheader()
+        self._start = time.perf_counter()
+        self._last_timings = defaultdict(int)
+
+    def add(self, generation, best, mean=None, diversity=None):
+        row = {"generation": generation, "best": best, "mean": mean, "diversity": diversity,
+               "time_s": round(time.perf_counter() - self._start, 6)}
+        for phase in self.phases:
+            total = self.telemetry.timings_ns[phase]
+            row[f"{phase}_ms"] = round((total - self._last_timings[phase]) / 1e6, 4)
+            self._last_timings[phase] = total
+        if self.csv:
+            self._writer.writerow(row)
+        else:
+            self._file.write(json.dumps(row) + "\n")
+
+    def close(self):
+        self._file.close()
@@ -1,43 +1,6 @@
 import json
 
 
-def get_lon_lat(individual):
-    """
-    Extracting latitude, longitude and corresponding distances with countries included for further processing.
-    """
-    chromosome = individual.chromosome
-    paths = []
-    for idx in range(0, len(chromosome)):
-        from_ = chromosome[idx]
-        if idx + 1 < len(chromosome):
-            to = chromosome[idx + 1]
-        else:
-            to = chromosome[0]
-        paths.append([individual.distance_coords_dict[from_ + "-" + to][1], from_, to,
-                      individual.distance_coords_dict[from_ + "-" + to][0]])
-    return paths
-
-
-def add_routes(best_individual, generation):
-    """
-    Creates data list with corresponding values for graph plot.
-    """
-    data = []
-    paths = get_lon_lat(best_individual[0])
-    first_path = True
-
-    for path in paths:
-        color = "#32CD32"
-        if first_path:
-            color = "firebrick"
-        data.append([path[0][0], path[0][1], generation, path[1],
-                     str(path[1]) + "-" + str(path[2]) + ": " + str(path[3]) + " km", best_individual[1], color])
-        data.append([path[0][2], path[0][3], generation, path[2],
-                     str(path[2]) + "-" + str(path[1]) + ": " + str(path[3]) + " km", best_individual[1], color])
-        first_path = False
-    return data
-
-
 def json_str_or_path(s):
     """
     JSON parser for argument parsing, when JSON file is provided.
@@ -67,6 +30,22 @@ def json_init_args(args, ga_config, data_config):
         args.iter_stop = ga_config["iter_stop"]
         args.tournament_k = ga_config["tournament_k"]
         args.same_parents = ga_config["same_parents"]
+        args.seed = ga_config.get("seed", args.seed)
+        args.quiet = ga_config.get("quiet", args.quiet)
+        args.telemetry_path = ga_config.get("telemetry_path", args.telemetry_path)
+        args.checkpoint_every = ga_config.get("checkpoint_every", args.checkpoint_every)
+        args.fitness_mode = ga_config.get("fitness_mode", args.fitness_mode)
+        args.crossover = ga_config.get("crossover", args.crossover)
+        args.backend = ga_config.get("backend", args.backend)
+        args.local_search = ga_config.get("local_search", args.local_search)
+        args.seeding = ga_config.get("seeding", args.seeding)
+        args.convergence = ga_config.get("convergence", args.convergence)
+        args.memo_size = ga_config.get("memo_size", args.memo_size)
+        args.deduplicate = ga_config.get("deduplicate", args.deduplicate)
+        args.objectives = ga_config.get("objectives", args.objectives)
+        args.islands = ga_config.get("islands", args.islands)
+        args.migration_interval = ga_config.get("migration_interval", args.migration_interval)
+        args.migrants = ga_config.get("migrants", args.migrants)
     if data_config is not None:
         args.csv_data_path = data_config["csv_data_path"]
         args.n_rows = data_config["n_rows"]
@@ -74,5 +53,14 @@ def json_init_args(args, ga_config, data_config):
         args.save_path = data_config["save_path"]
         args.selected_places = data_config["selected_places"]
         args.choose_my_route = data_config["choose_my_route"]
+        args.sparse_neighbours = data_config.get("sparse_neighbours", args.sparse_neighbours)
+        args.cache_dir = data_config.get("cache_dir", args.cache_dir)
+        args.cache_max_mb = data_config.get("cache_max_mb", args.cache_max_mb)
+        args.frames_dir = data_config.get("frames_dir", args.frames_dir)
+        args.frame_every = data_config.get("frame_every", args.frame_every)
+        args.max_frames = data_config.get("max_frames", args.max_frames)
+        args.render_max_frames = data_config.get("render_max_frames", args.render_max_frames)
+        args.include_plotlyjs = data_config.get("include_plotlyjs", args.include_plotlyjs)
+        args.no_show = data_config.get("no_show", args.no_show)
 
     return args
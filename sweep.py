@@ -0,0 +1,157 @@
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import csv
+import glob
+import itertools
+import json
+import os
+import numpy as np
+from main import parse_arguments, get_ga_kwargs
+from src.cache import DistanceCache
+from src.dataset import Dataset
+from src.shared import share_array
+from src.sweep import run_task
+from src.utils import json_str_or_path, json_init_args
+
+SUMMARY_FIELDS = ["run", "ga_config", "data_config", "overrides", "seed", "places", "best_distance", "generations",
+                  "wall_s", "generations_per_s"]
+
+
+def parse_sweep_arguments():
+    """
+    Argument parsing
+    """
+    parser = ArgumentParser()
+    parser.add_argument("--examples", help="Example directories, each with ga_config.json and data_config.json "
+                                           "(glob patterns are allowed).", type=str, nargs="*", default=[])
+    parser.add_argument("--ga-configs", help="GA configs, combined with every data config.", type=str, nargs="*",
+                        default=[])
+    parser.add_argument("--data-configs", help="Data configs, combined with every GA config.", type=str, nargs="*",
+                        default=[])
+    parser.add_argument("--grid", help="JSON object of GA parameters (argument names of main.py) and lists of their "
+                                       "values, every combination is run with every config, e.g. "
+                                       "'{\"population\": [100, 500], \"selection\": [\"tournament\"]}'.",
+                        type=json_str_or_path, default={})
+    parser.add_argument("--seeds", help="Seeds, every run is repeated with each.", type=int, nargs="+", default=[0])
+    parser.add_argument("--max-generations", help="Limit of generations of one run.", type=int, default=None)
+    parser.add_argument("--workers", help="Number of worker processes.", type=int, default=os.cpu_count())
+    parser.add_argument("--output", help="Path of CSV summary table.", type=str, default="./sweep_summary.csv")
+    return parser.parse_args()
+
+
+def config_pairs(args):
+    """
+    List of (ga_config path, data_config path) given by examples and by combinations of GA and data configs.
+    """
+    pairs = []
+    for pattern in args.examples:
+        for example_dir in sorted(glob.glob(pattern)):
+            pairs.append((os.path.join(example_dir, "ga_config.json"), os.path.join(example_dir, "data_config.json")))
+    pairs += list(itertools.product(args.ga_configs, args.data_configs))
+    if not pairs:
+        raise Exception("No configs to run, use --examples or --ga-configs with --data-configs.")
+    return pairs
+
+
+def grid_overrides(grid):
+    """
+    All combinations of grid values as list of dictionaries.
+    """
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def main():
+    """
+    Batch experiment runner. Runs are grouped by dataset, every distance matrix is built once in this process and shared
+    with worker processes through shared memory (sparse distance matrix is small and every run gets its own copy).
+    Distance matrices are loaded from the persistent cache, if cache_dir is set in data config. Runs are spread across
+    the process pool and the results are collected to one summary table.
+    """
+    sweep_args = parse_sweep_arguments()
+
+    runs = []
+    for (ga_path, data_path), overrides, seed in itertools.product(config_pairs(sweep_args),
+                                                                   grid_overrides(sweep_args.grid), sweep_args.seeds):
+        args = json_init_args(parse_arguments([]), json_str_or_path(ga_path), json_str_or_path(data_path))
+        for name, value in overrides.items():
+            if not hasattr(args, name):
+                raise Exception(f"Unknown GA parameter in grid: {name}.")
+            setattr(args, name, value)
+        if args.islands > 1 or args.checkpoint_path is not None or args.resume:
+            raise Exception(f"Islands and checkpointing are not supported by sweep: {ga_path}, {data_path}.")
+        if sweep_args.max_generations is not None:
+            args.generations = min(args.generations, sweep_args.max_generations)
+        runs.append({"run": len(runs), "ga_config": ga_path, "data_config": data_path,
+                     "overrides": json.dumps(overrides), "seed": seed, "args": args})
+
+    # one dataset (and one shared distance matrix) for every distinct csv, selection of places and sparsity
+    datasets = {}
+    caches = {}
+    blocks = []
+    tasks = []
+    for run in runs:
+        args = run["args"]
+        dataset_seed, ga_seed = np.random.SeedSequence(run["seed"]).spawn(2)
+        dataset_rng = np.random.default_rng(dataset_seed)
+        key = DistanceCache.key(args.csv_data_path, args.n_rows, args.random_pick_dataset, args.choose_my_route,
+                                args.selected_places, np.float64,
+                                dataset_rng.bit_generator.state if args.random_pick_dataset else None)
+        key = (key, args.sparse_neighbours)
+        if key not in datasets:
+            cache = None
+            if args.cache_dir is not None:
+                if args.cache_dir not in caches:
+                    caches[args.cache_dir] = DistanceCache(args.cache_dir, int(args.cache_max_mb * 2 ** 20))
+                cache = caches[args.cache_dir]
+            dataset = Dataset(args.csv_data_path, args.n_rows, args.random_pick_dataset, args.choose_my_route,
+                              args.selected_places, cache=cache, rng=dataset_rng,
+                              sparse_neighbours=args.sparse_neighbours)
+            dataset.__build__()
+            if isinstance(dataset.distance_matrix, np.ndarray):
+                shm, spec = share_array(np.ascontiguousarray(dataset.distance_matrix))
+                blocks.append(shm)
+            else:
+                spec = dataset.distance_matrix
+            datasets[key] = (len(dataset), spec, dataset.coords, dataset.countries)
+        run["places"], spec, coords, countries = datasets[key]
+        tasks.append({"run": run["run"], "matrix": spec, "coords": coords, "countries": countries,
+                      "ga_kwargs": get_ga_kwargs(args), "seed": ga_seed, "generations": args.generations,
+                      "iter_stop": args.iter_stop, "convergence": args.convergence})
+    print(f"{len(runs)} runs, {len(datasets)} datasets, {sweep_args.workers} workers")
+
+    results = {}
+    try:
+        with ProcessPoolExecutor(max_workers=sweep_args.workers) as executor:
+            futures = [executor.submit(run_task, task) for task in tasks]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result["run"]] = result
+                print(f"run #{result['run']}: best distance {result['best_distance']:.1f} km, "
+                      f"{result['generations']} generations, {result['wall_s']} s")
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    rows = []
+    for run in runs:
+        row = {field: run.get(field) for field in SUMMARY_FIELDS}
+        row.update({field: value for field, value in results[run["run"]].items() if field in SUMMARY_FIELDS})
+        rows.append(row)
+    with open(sweep_args.output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"{'run':>4}  {'ga_config':<36}{'overrides':<28}{'seed':>5}{'places':>7}{'best [km]':>13}"
+          f"{'generations':>12}{'wall [s]':>10}{'gen/s':>10}")
+    for row in rows:
+        print(f"{row['run']:>4}  {row['ga_config'][-36:]:<36}{row['overrides'][:28]:<28}{row['seed']:>5}"
+              f"{row['places']:>7}{row['best_distance']:>13.1f}{row['generations']:>12}{row['wall_s']:>10}"
+              f"{row['generations_per_s']:>10}")
+    print(f"Summary saved to {sweep_args.output}")
+
+
+if __name__ == '__main__':
+    main()
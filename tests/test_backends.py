@@ -0,0 +1,111 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.backends import Backend, numba_available  # noqa: E402
+from src.dataset import Dataset  # noqa: E402
+from src.ga import GA  # noqa: E402
+from src.individual import Individual  # noqa: E402
+from src.local_search import LocalSearch  # noqa: E402
+from src.objectives import Objectives  # noqa: E402
+from src.population import Population  # noqa: E402
+
+BACKENDS = ["python"] + (["numba"] if numba_available() else [])
+
+
+def random_dataset(n_cities, rng):
+    coords = np.column_stack((rng.uniform(-60, 70, n_cities), rng.uniform(-180, 180, n_cities)))
+    lat, lng = coords[:, 0], coords[:, 1]
+    distance_matrix = Dataset.get_distance_from_lat_lon_in_km(lat[:, None], lng[:, None], lat[None, :], lng[None, :])
+    return Dataset.from_arrays(distance_matrix, coords)
+
+
+def run_operators(backend, dataset, routes, seed):
+    """
+    Runs every operator of backend on copies of the same routes with the same seed.
+    """
+    distance_matrix = dataset.distance_matrix
+    results = {}
+    population = Population(routes.copy())
+    kernel = backend.kernel("tour_lengths")
+    if kernel is None:
+        population.evaluate_batched(distance_matrix)
+    else:
+        kernel(distance_matrix, population.routes, np.arange(len(routes)), population.fitness)
+    results["tour length"] = population.fitness.copy()
+
+    population.mutate(np.arange(len(routes)), 0.95, 0.05, distance_matrix, np.random.default_rng(seed),
+                      backend.kernel("swap_mutation"))
+    results["swap mutation"] = (population.routes.copy(), population.fitness.copy())
+
+    half = len(routes) // 2
+    for name in ("ox", "pmx"):
+        results[name] = backend.crossover(name)(routes[:half], routes[half:2 * half], np.random.default_rng(seed))
+
+    local_search = LocalSearch(distance_matrix, max_passes=1, or_opt=False, two_opt=backend.kernel("two_opt"))
+    results["2-opt"] = local_search.improve(routes[0])
+    return results
+
+
+def run_ga(backend, dataset, seed, generations=10):
+    ga = GA(100, dataset, True, 0.95, 0.95, 20, "tournament", 0.05, 10, False, crossover="pmx",
+            local_search={"elite": 2}, rng=seed, backend=backend)
+    ga.init_population()
+    ga.fitness()
+    for _ in range(generations):
+        ga.new_population()
+        ga.fitness()
+    return ga.population.routes.copy(), ga.population.fitness.copy()
+
+
+def assert_equal(result, reference):
+    if isinstance(reference, tuple):
+        for value, expected in zip(result, reference):
+            np.testing.assert_array_equal(value, expected)
+    else:
+        np.testing.assert_array_equal(result, reference)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("n_cities", [5, 17, 60, 300])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_operators_equal_to_numpy(backend, n_cities, seed):
+    rng = np.random.default_rng(seed)
+    dataset = random_dataset(n_cities, rng)
+    routes = Population.random_routes(200, n_cities, rng)
+    reference = run_operators(Backend("numpy"), dataset, routes, seed)
+    results = run_operators(Backend(backend), dataset, routes, seed)
+    for operator, expected in reference.items():
+        assert_equal(results[operator], expected)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("n_cities", [17, 60, 200])
+def test_ga_equal_to_numpy(backend, n_cities):
+    dataset = random_dataset(n_cities, np.random.default_rng(n_cities))
+    assert_equal(run_ga(backend, dataset, 3), run_ga("numpy", dataset, 3))
+
+
+@pytest.mark.parametrize("n_cities", [5, 17, 300])
+def test_evaluations_equal_to_kernel(n_cities):
+    rng = np.random.default_rng(n_cities)
+    dataset = random_dataset(n_cities, rng)
+    routes = Population.random_routes(50, n_cities, rng)
+    expected = Population(routes.copy())
+    Backend("python").kernel("tour_lengths")(dataset.distance_matrix, expected.routes, np.arange(50), expected.fitness)
+
+    population = Population(routes.copy())
+    population.evaluate(dataset.distance_matrix)
+    np.testing.assert_array_equal(population.fitness, expected.fitness)
+    population = Population(routes.copy())
+    population.evaluate_batched(dataset.distance_matrix, np.arange(50), chunk_size=7)
+    np.testing.assert_array_equal(population.fitness, expected.fitness)
+    np.testing.assert_array_equal(Objectives(dataset.distance_matrix).evaluate(routes)[:, 0], expected.fitness)
+    individual = Individual(dataset, 0.0, 0.0)
+    for route, fitness in zip(routes, expected.fitness):
+        individual.set_chromosome(route.tolist())
+        assert individual.fitness() == fitness
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.dataset import Dataset  # noqa: E402
+from src.ga import GA  # noqa: E402
+from src.memo import route_hashes  # noqa: E402
+from src.population import Population  # noqa: E402
+
+
+def random_dataset(n_cities, rng):
+    coords = np.column_stack((rng.uniform(35, 60, n_cities), rng.uniform(-10, 30, n_cities)))
+    lat, lng = coords[:, 0], coords[:, 1]
+    distance_matrix = Dataset.get_distance_from_lat_lon_in_km(lat[:, None], lng[:, None], lat[None, :], lng[None, :])
+    return Dataset.from_arrays(distance_matrix, coords)
+
+
+def test_hashes_invariant_to_rotation_and_direction():
+    route = np.random.default_rng(0).permutation(20).astype(np.int32)
+    routes = np.array([np.roll(route, shift) for shift in range(20)] + [np.roll(route[::-1], 3)])
+    assert len(np.unique(route_hashes(routes))) == 1
+    assert len(np.unique(route_hashes(routes, directed=True))) == 2
+
+
+@pytest.mark.parametrize("deduplicate", ["random", "mutate"])
+@pytest.mark.parametrize("n_cities", [8, 12, 40])
+def test_clones_replaced(deduplicate, n_cities):
+    dataset = random_dataset(n_cities, np.random.default_rng(n_cities))
+    ga = GA(50, dataset, True, 0.9, 0.5, 20, "tournament", 0.05, 5, False, rng=0, deduplicate=deduplicate)
+    ga.population = Population(np.tile(np.arange(n_cities, dtype=np.int32), (50, 1)))
+    ga.fitness()
+    assert ga.telemetry.counters["duplicates_replaced"] == 49
+    assert len(np.unique(route_hashes(ga.population.routes))) == 50
+    expected = Population(ga.population.routes.copy())
+    expected.evaluate_batched(dataset.distance_matrix)
+    np.testing.assert_allclose(ga.population.fitness, expected.fitness)
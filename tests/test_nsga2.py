@@ -0,0 +1,71 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.dataset import Dataset  # noqa: E402
+from src.ga import GA  # noqa: E402
+from src.nsga2 import crowding_distance, non_dominated_ranks  # noqa: E402
+
+
+def random_dataset(n_cities, rng):
+    coords = np.column_stack((rng.uniform(35, 60, n_cities), rng.uniform(-10, 30, n_cities)))
+    lat, lng = coords[:, 0], coords[:, 1]
+    distance_matrix = Dataset.get_distance_from_lat_lon_in_km(lat[:, None], lng[:, None], lat[None, :], lng[None, :])
+    return Dataset.from_arrays(distance_matrix, coords, [f"place{idx}" for idx in range(n_cities)])
+
+
+def brute_force_ranks(values):
+    remaining = set(range(len(values)))
+    ranks = np.full(len(values), -1)
+    rank = 0
+    while remaining:
+        front = [i for i in remaining
+                 if not any(np.all(values[j] <= values[i]) and np.any(values[j] < values[i]) for j in remaining)]
+        ranks[front] = rank
+        remaining -= set(front)
+        rank += 1
+    return ranks
+
+
+def brute_force_crowding(values, ranks):
+    distance = np.zeros(len(values))
+    for rank in np.unique(ranks):
+        front = np.flatnonzero(ranks == rank)
+        for objective in values.T:
+            ordered = front[np.argsort(objective[front], kind="stable")]
+            distance[ordered[[0, -1]]] = np.inf
+            span = objective[ordered[-1]] - objective[ordered[0]]
+            if span > 0:
+                distance[ordered[1:-1]] += (objective[ordered[2:]] - objective[ordered[:-2]]) / span
+    return distance
+
+
+@pytest.mark.parametrize("n_objectives", [1, 2, 3])
+def test_ranks_and_crowding(n_objectives):
+    # integer values, so ties and duplicate points occur
+    values = np.random.default_rng(n_objectives).integers(0, 15, (200, n_objectives)).astype(np.float64)
+    ranks = non_dominated_ranks(values, block_size=64)
+    np.testing.assert_array_equal(ranks, brute_force_ranks(values))
+    np.testing.assert_allclose(crowding_distance(values, ranks), brute_force_crowding(values, ranks))
+
+
+def test_best_is_first_and_kept_by_elitism():
+    rng = np.random.default_rng(0)
+    dataset = random_dataset(60, rng)
+    windows = {f"place{idx}": [float(start), float(start) + 2] for idx, start in enumerate(rng.uniform(0, 20, 15))}
+    objectives = {"names": ["distance", "time", "time_windows"], "weights": [1, 10, 30], "service_time": 0.25,
+                  "time_windows": windows}
+    ga = GA(60, dataset, True, 0.9, 0.5, 20, "nsga2", 0.05, 5, False, rng=0, objectives=objectives)
+    ga.init_population()
+    last_best = np.inf
+    for _ in range(60):
+        ga.fitness()
+        best = ga.best()[1]
+        assert best == ga.population.fitness.min()
+        assert best <= last_best
+        last_best = best
+        ga.new_population()